@@ -1,5 +1,6 @@
 
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -25,6 +26,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'tasks.middleware.QueryTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -39,8 +41,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept in memory. With DEBUG on, the
+            # autoreloader clears them whenever a template file changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -53,12 +62,167 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'task_project.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database selection comes from the environment: SQLite (the default) is tuned
+# for concurrent writers, PostgreSQL uses psycopg's connection pool. The pool
+# needs the optional psycopg[pool] package (see requirements.txt), which is
+# not installed by default.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'task_management'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Pooled connections replace persistent ones, so CONN_MAX_AGE stays 0.
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+                    'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+                },
+            },
+        }
     }
-}
+else:
+    SQLITE_OPTIONS = {
+        # Seconds a writer waits for the lock before "database is locked".
+        'timeout': int(os.environ.get('SQLITE_TIMEOUT', 20)),
+    }
+    if os.environ.get('SQLITE_TUNING', '1') == '1':
+        SQLITE_OPTIONS.update({
+            # Take the write lock up front instead of upgrading mid-transaction,
+            # which is what makes concurrent writers fail immediately.
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_SIZE', 134217728))};"
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        })
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            # Persistent connections must stay off under ASGI, where every request
+            # runs in its own thread. WSGI-only deployments can opt in with
+            # DB_CONN_MAX_AGE=<seconds>.
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': SQLITE_OPTIONS,
+        }
+    }
+    if os.environ.get('SQLITE_REPLICA_PATH'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'NAME': os.environ['SQLITE_REPLICA_PATH'],
+            'TEST': {'MIRROR': 'default'},
+        }
+
+if DB_ENGINE == 'postgresql' and os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# With a replica configured, GET handlers in tasks.views and tasks.async_views
+# read from it; writes, and reads shortly after a write by the same client,
+# stay on the primary.
+if 'replica' in DATABASES:
+    DATABASE_ROUTERS = ['tasks.routers.ReplicaRouter']
+    MIDDLEWARE.append('tasks.routers.ReplicaRoutingMiddleware')
+
+# Seconds a client keeps reading from the primary after one of its writes.
+TASKS_REPLICA_PIN_SECONDS = 10
+
+# The scope, token version and summary caches are cleared when a user is
+# reassigned or revoked, but a LocMemCache clear only reaches the process that
+# made the change. Run several workers with a shared cache (REDIS_URL, needs
+# the optional redis package); otherwise other workers may serve stale entries
+# for up to their timeouts below.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'task-management',
+        }
+    }
+
+# Seconds a cached task table or row fragment is kept. Fragments are keyed on
+# the rows' updated_at, so edits show at once; only renamed users wait this out.
+TASKS_FRAGMENT_CACHE_TIMEOUT = 300
+
+# Seconds a role-scoped dashboard summary may be served from cache.
+TASKS_SUMMARY_CACHE_TIMEOUT = 300
+
+# Seconds an admin's set of managed user ids may be served from cache. Used
+# for reads only; bulk task creation checks the assignments in the database.
+TASKS_SCOPE_CACHE_TIMEOUT = 300
+
+# Default and maximum rows per page on the keyset-paginated list views.
+TASKS_PAGE_SIZE = 50
+TASKS_MAX_PAGE_SIZE = 500
+
+# Bulk task endpoints: rows per INSERT/UPDATE batch and rows per request.
+TASKS_BULK_BATCH_SIZE = 500
+TASKS_BULK_MAX_ROWS = 5000
+
+# Rows fetched per database round trip by the streaming report exports.
+TASKS_EXPORT_CHUNK_SIZE = 2000
+
+# Tasks scanned per batch when rebuilding the daily rollups.
+TASKS_ROLLUP_BATCH_SIZE = 2000
+
+# Delta sync: rows per response, seconds a write has to commit before the
+# sync cursor moves past it, and days tombstones of deleted tasks are kept.
+TASKS_SYNC_PAGE_SIZE = 500
+TASKS_SYNC_SETTLE_SECONDS = 2
+TASKS_TOMBSTONE_RETENTION_DAYS = 30
+
+# Task search: most results per query, and tasks per batch when rebuilding
+# the SQLite full-text index.
+TASKS_SEARCH_MAX_RESULTS = 100
+TASKS_SEARCH_BATCH_SIZE = 2000
+
+# Background jobs: attempts before a job fails, base seconds between retries
+# (doubled each time), seconds without progress before a running job counts as
+# abandoned, rows per batch, where background exports are written, and
+# whether jobs run in-process on commit instead of waiting for run_jobs.
+TASKS_JOB_MAX_ATTEMPTS = 3
+TASKS_JOB_RETRY_DELAY_SECONDS = 30
+TASKS_JOB_TIMEOUT_SECONDS = 3600
+TASKS_JOB_BATCH_SIZE = 500
+TASKS_JOB_EXPORT_DIR = BASE_DIR / 'exports'
+TASKS_JOB_EAGER = False
+
+# Archival: completed tasks untouched for this many days move to the archive
+# table (archive_tasks command or job), this many per transaction.
+TASKS_ARCHIVE_AFTER_DAYS = 365
+TASKS_ARCHIVE_BATCH_SIZE = 1000
+
+# Unfiltered admin changelists of tables with more rows than this are counted
+# from the planner statistics (PostgreSQL, or SQLite after ANALYZE).
+TASKS_ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+
+# Server-sent task events: events buffered per stream before a slow client is
+# cut off (it then resyncs through the changes endpoint), and seconds between
+# keepalive comments on an idle stream.
+TASKS_SSE_QUEUE_SIZE = 100
+TASKS_SSE_KEEPALIVE_SECONDS = 15
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -90,7 +254,7 @@ AUTH_USER_MODEL = 'tasks.CustomUser'
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "tasks.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -103,7 +267,26 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'tasks.authentication.RoleTokenObtainPairSerializer',
 }
 
+# Repeats of one SQL statement within a request that get logged as a likely N+1.
+TASKS_DUPLICATE_QUERY_THRESHOLD = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'tasks.performance': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
+# Seconds a user's JWT token version may be served from cache. Without a shared
+# cache (see CACHES), this is how long other workers accept a revoked token.
+TASKS_TOKEN_VERSION_CACHE_TIMEOUT = 300
+
 LOGIN_URL = '/api/login/'
 LOGIN_REDIRECT_URL = '/api/dashboard/'
\ No newline at end of file
@@ -1,15 +1,84 @@
 # tasks/admin.py
 
-from django.contrib import admin
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, Task
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
+from .bulk import complete_tasks, reassign_tasks
+from .models import ArchivedTask, CustomUser, Job, Task
+from .search import matching_tasks_sql, search_terms
+
+ESTIMATED_COUNT_THRESHOLD = getattr(settings, 'TASKS_ADMIN_ESTIMATED_COUNT_THRESHOLD', 10000)
+
+
+def estimated_row_count(model, using):
+    """The planner's row estimate for ``model``'s table, or None if it has none."""
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table]
+                )
+            elif connection.vendor == 'sqlite':
+                # Only present once ANALYZE (or PRAGMA optimize) has run.
+                cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    # PostgreSQL reports -1 for a table that was never analyzed.
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts an unfiltered changelist from the planner statistics instead of
+    ``COUNT(*)`` once the table is big enough for that to matter. Filtered
+    lists are still counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class TaskActionForm(ActionForm):
+    assignee = forms.ModelChoiceField(
+        queryset=CustomUser.objects.filter(role='user'),
+        required=False,
+        label='Reassign to',
+        widget=AutocompleteSelect(Task._meta.get_field('assigned_to'), admin.site),
+    )
 
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'role', 'assigned_admin', 'is_staff')
     list_filter = ('role', 'is_staff', 'is_active')
+    list_select_related = ('assigned_admin',)
     search_fields = ('username', 'email', 'first_name', 'last_name')
+    autocomplete_fields = ('assigned_admin',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = UserAdmin.fieldsets + (
         ('Custom Fields', {'fields': ('role', 'assigned_admin')}),
@@ -24,8 +93,13 @@ class CustomUserAdmin(UserAdmin):
 class TaskAdmin(admin.ModelAdmin):
     list_display = ('title', 'assigned_to', 'created_by', 'status', 'due_date', 'worked_hours')
     list_filter = ('status', 'due_date', 'created_at')
+    list_select_related = ('assigned_to', 'created_by')
     search_fields = ('title', 'description', 'assigned_to__username')
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ('assigned_to', 'created_by')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = TaskActionForm
+    actions = ('mark_completed', 'reassign')
     
     fieldsets = (
         ('Task Information', {
@@ -41,4 +115,62 @@ class TaskAdmin(admin.ModelAdmin):
     def get_readonly_fields(self, request, obj=None):
         if obj:  # Editing existing object
             return self.readonly_fields + ('created_by',)
-        return self.readonly_fields
\ No newline at end of file
+        return self.readonly_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        # The full-text index instead of LIKE '%term%' over every row.
+        terms = search_terms(search_term)
+        if not terms:
+            return queryset, False
+        sql, params = matching_tasks_sql(terms, queryset.db)
+        return queryset.filter(
+            Q(pk__in=RawSQL(sql, params)) | Q(assigned_to__username=search_term.strip())
+        ), False
+
+    @admin.action(description='Mark selected tasks as completed', permissions=['change'])
+    def mark_completed(self, request, queryset):
+        updated = complete_tasks(queryset)
+        self.message_user(request, f'{updated} tasks marked as completed.', messages.SUCCESS)
+
+    @admin.action(description='Reassign selected tasks', permissions=['change'])
+    def reassign(self, request, queryset):
+        try:
+            assignee = self.action_form.base_fields['assignee'].clean(request.POST.get('assignee'))
+        except ValidationError:
+            assignee = None
+        if assignee is None:
+            self.message_user(request, 'Choose a user to reassign the tasks to.', messages.ERROR)
+            return
+        updated = reassign_tasks(queryset, assignee)
+        self.message_user(
+            request, f'{updated} tasks reassigned to {assignee.username}.', messages.SUCCESS
+        )
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = ('id', 'title', 'assigned_to', 'worked_hours', 'updated_at', 'archived_at')
+    list_select_related = ('assigned_to',)
+    search_fields = ('=id', '^title', '=assigned_to__username')
+    readonly_fields = [field.name for field in ArchivedTask._meta.fields]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'kind', 'status', 'attempts', 'progress_done', 'progress_total',
+        'created_by', 'created_at',
+    )
+    list_filter = ('status', 'kind')
+    list_select_related = ('created_by',)
+    readonly_fields = [field.name for field in Job._meta.fields]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
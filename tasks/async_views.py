@@ -0,0 +1,133 @@
+# tasks/async_views.py
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from .authentication import ClaimsJWTAuthentication
+from .events import broker, event_stream
+from .exports import (
+    EXPORT_FORMATS, ExportFilterError, completed_tasks, completed_tasks_for_export,
+    export_response,
+)
+from .models import Task
+from .pagination import TaskPagination, apaginated_response
+from .renderers import dumps
+from .summary import aget_summary
+from .views import TASK_LIST_SERIALIZER, TASK_REPORT_SERIALIZER
+
+# Columns the keyset cursors are built from.
+PAGE_KEY = ("id", TaskPagination.key_field)
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    # Same encoding as the FastJSONRenderer output of tasks.views.
+    return HttpResponse(dumps(data), content_type="application/json", status=status)
+
+
+async def authenticate(request):
+    """Bearer token first (as ``ClaimsJWTAuthentication``), then the session user."""
+    if request.headers.get("Authorization"):
+        result = await sync_to_async(ClaimsJWTAuthentication().authenticate)(request)
+        if result is not None:
+            return result[0]
+    # request.user rather than auser(): ReplicaRoutingMiddleware may already
+    # have loaded it from the primary, and auser() keeps a separate cache.
+    user = request.user
+    if not await sync_to_async(lambda: user.is_authenticated)():
+        raise NotAuthenticated()
+    return user
+
+
+class AsyncAPIView(View):
+    """
+    Base for the read-only JSON endpoints served natively under ASGI.
+
+    DRF's APIView only runs synchronously, so authentication and the
+    ``{"detail": ...}`` error body are handled here instead.
+    """
+    http_method_names = ["get", "head", "options"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await authenticate(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as e:
+            # Same body shape as DRF's default exception handler.
+            data = e.detail if isinstance(e.detail, (list, dict)) else {"detail": e.detail}
+            return json_response(data, status=e.status_code)
+
+
+# ---------------- DASHBOARD ---------------- #
+
+class AsyncDashboardView(AsyncAPIView):
+    async def get(self, request):
+        return json_response(await aget_summary(request.user))
+
+
+# ---------------- TASKS ---------------- #
+
+class AsyncTaskListView(AsyncAPIView):
+    async def get(self, request):
+        tasks = await sync_to_async(Task.objects.for_user)(request.user)
+        tasks = TASK_LIST_SERIALIZER.values(tasks.with_people(), request, required=PAGE_KEY)
+        return await apaginated_response(request, tasks, "tasks")
+
+
+class AsyncTaskReportView(AsyncAPIView):
+    async def get(self, request):
+        export_format = request.GET.get("export")
+        if export_format:
+            return await self.export(request, export_format)
+
+        try:
+            # May load an admin's scope and check the archive, both sync queries.
+            tasks, archived = await sync_to_async(completed_tasks)(request.user, request.GET)
+        except ExportFilterError as e:
+            return json_response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = TASK_REPORT_SERIALIZER.values(tasks.with_people(), request, required=PAGE_KEY)
+        if archived is not None:
+            archived = TASK_REPORT_SERIALIZER.values(
+                archived.with_people(), request, required=PAGE_KEY
+            )
+        return await apaginated_response(request, tasks, "tasks", archived=archived)
+
+    async def export(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            return json_response(
+                {"detail": f"export must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            tasks = await sync_to_async(completed_tasks_for_export)(request.user, request.GET)
+        except ExportFilterError as e:
+            return json_response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return export_response(tasks, export_format, asynchronous=True)
+
+
+# ---------------- EVENTS ---------------- #
+
+class TaskEventStreamView(AsyncAPIView):
+    """
+    Server-sent events for tasks created or updated in the caller's scope.
+
+    Events come from this process only, so every writer has to run in the
+    same ASGI process as the streams.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            # WSGI would have to buffer the endless stream before sending it.
+            return json_response(
+                {"detail": "The event stream is only served by the ASGI application"},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        subscription = broker.subscribe(request.user)
+        response = StreamingHttpResponse(
+            event_stream(subscription), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,111 @@
+# tasks/authentication.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .models import CustomUser, managed_user_ids
+
+TOKEN_VERSION_CACHE_TIMEOUT = getattr(settings, "TASKS_TOKEN_VERSION_CACHE_TIMEOUT", 300)
+
+
+def token_version_cache_key(user_id):
+    return f"tasks:token_version:{user_id}"
+
+
+def current_token_version(user_id):
+    """The user's token version, or None if the user is gone or inactive."""
+    key = token_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Always the primary: a replica lagging behind a revocation must not
+        # let the old token through.
+        row = (
+            CustomUser.objects.using(DEFAULT_DB_ALIAS)
+            .filter(pk=user_id)
+            .values_list("token_version", "is_active")
+            .first()
+        )
+        version = row[0] if row and row[1] else -1
+        cache.set(key, version, TOKEN_VERSION_CACHE_TIMEOUT)
+    return None if version < 0 else version
+
+
+# ---------------- ISSUANCE ---------------- #
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        token["role"] = user.role
+        token["assigned_admin_id"] = user.assigned_admin_id
+        token["ver"] = user.token_version
+        return token
+
+
+# ---------------- AUTHENTICATION ---------------- #
+
+class ClaimsUser(TokenUser):
+    """Stand-in for ``CustomUser`` built only from the token's claims."""
+    ROLE_LABELS = dict(CustomUser.ROLE_CHOICES)
+
+    @cached_property
+    def id(self):
+        return int(super().id)
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def role(self):
+        return self.token["role"]
+
+    @cached_property
+    def assigned_admin_id(self):
+        return self.token.get("assigned_admin_id")
+
+    def get_role_display(self):
+        return self.ROLE_LABELS.get(self.role, self.role)
+
+    def managed_user_ids(self):
+        return managed_user_ids(self.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the user lookup on read-only requests.
+
+    Safe methods get a ``ClaimsUser`` built from the token; writes still
+    load the real user. Either way the token's ``ver`` claim must match the
+    user's current (cached) token version, so role or admin changes,
+    password resets and deactivation revoke outstanding tokens.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        if "role" not in validated_token or "ver" not in validated_token:
+            # Issued before claims were embedded; fall back to the database.
+            return self.get_user(validated_token), validated_token
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if current_token_version(user_id) != validated_token["ver"]:
+            raise InvalidToken("Token is no longer valid")
+
+        if request.method in SAFE_METHODS:
+            return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
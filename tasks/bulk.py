@@ -0,0 +1,340 @@
+# tasks/bulk.py
+
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .authentication import token_version_cache_key
+from .events import publish_tasks
+from .models import CustomUser, Task, TaskRollup, managed_users_cache_key
+from .rollups import apply_deltas, deltas_between, merge_deltas, record_tasks, snapshot
+from .search import index_task_ids, unindex_task_ids
+from .summary import invalidate_summaries
+from .sync import record_scope_change, record_tombstones
+
+BULK_BATCH_SIZE = getattr(settings, "TASKS_BULK_BATCH_SIZE", 500)
+BULK_MAX_ROWS = getattr(settings, "TASKS_BULK_MAX_ROWS", 5000)
+UPDATABLE_STATUSES = ("in_progress", "completed")
+UPDATE_FIELDS = ["status", "worked_hours", "completion_report", "updated_at"]
+# Loaded by update_tasks() for the rollups and task events.
+TRACKED_FIELDS = (
+    "title", "assigned_to", "created_by", "due_date", "status",
+    "worked_hours", "created_at", "updated_at",
+)
+
+
+class BulkPayloadError(ValueError):
+    pass
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_date(value):
+    try:
+        return parse_date(str(value or ""))
+    except ValueError:
+        # Well formed but impossible, such as 2026-02-30.
+        return None
+
+
+def _as_hours(value):
+    try:
+        hours = Decimal(str(value)).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        return None
+    if hours < 0 or hours >= 10000:
+        return None
+    return hours
+
+
+# ---------------- PARSING ---------------- #
+
+def read_rows(request, key):
+    """
+    Return the list of row dicts sent either as a JSON array, a JSON object
+    holding the array under ``key``, or a CSV file uploaded as ``file``.
+    """
+    upload = request.FILES.get("file")
+    if upload is not None:
+        text = io.TextIOWrapper(upload.file, encoding="utf-8-sig")
+        rows = list(csv.DictReader(text))
+    elif isinstance(request.data, list):
+        rows = request.data
+    else:
+        rows = request.data.get(key)
+
+    if not isinstance(rows, list) or not rows:
+        raise BulkPayloadError(f"Expected a non-empty list of {key}")
+    if len(rows) > BULK_MAX_ROWS:
+        raise BulkPayloadError(f"At most {BULK_MAX_ROWS} {key} can be sent at once")
+    if not all(isinstance(row, dict) for row in rows):
+        raise BulkPayloadError(f"Every entry in {key} must be an object")
+    return rows
+
+
+# ---------------- BULK CREATE ---------------- #
+
+def build_tasks(rows, admin):
+    """
+    Validate ``rows`` against the users currently assigned to the admin.
+
+    Returns ``(tasks, errors)`` where ``errors`` maps row index to a list
+    of messages; ``tasks`` is only meaningful when ``errors`` is empty.
+    """
+    # One query rather than the cached scope, which another worker's
+    # reassignment only clears in that worker's cache.
+    allowed_ids = set(
+        CustomUser.objects.filter(
+            pk__in={_as_id(row.get("assigned_to")) for row in rows} - {None},
+            assigned_admin_id=admin.pk,
+            role="user",
+        ).values_list("id", flat=True)
+    )
+
+    tasks, errors = [], {}
+    for index, row in enumerate(rows):
+        row_errors = []
+        title = row.get("title") or ""
+        description = row.get("description") or ""
+        assigned_to_id = _as_id(row.get("assigned_to"))
+        due_date = _as_date(row.get("due_date"))
+
+        if not isinstance(title, str):
+            row_errors.append("title must be a string")
+        elif not title.strip():
+            row_errors.append("title is required")
+        if not isinstance(description, str):
+            row_errors.append("description must be a string")
+        if assigned_to_id not in allowed_ids:
+            row_errors.append("assigned_to must be one of your assigned users")
+        if due_date is None:
+            row_errors.append("due_date must be a YYYY-MM-DD date")
+
+        if row_errors:
+            errors[index] = row_errors
+            continue
+        tasks.append(Task(
+            title=title.strip(),
+            description=description,
+            assigned_to_id=assigned_to_id,
+            created_by=admin,
+            due_date=due_date,
+        ))
+    return tasks, errors
+
+
+def create_tasks(tasks, admin):
+    with transaction.atomic():
+        created = Task.objects.bulk_create(tasks, batch_size=BULK_BATCH_SIZE)
+        record_tasks(created)
+        index_task_ids([task.pk for task in created])
+        publish_tasks(created, created=True)
+    # bulk_create does not send post_save, so refresh the summaries by hand.
+    invalidate_summaries(
+        user_ids={task.assigned_to_id for task in created}, admin_ids=[admin.pk]
+    )
+    return created
+
+
+# ---------------- BULK UPDATE ---------------- #
+
+def build_task_updates(rows, user):
+    """
+    Apply ``rows`` to the user's own tasks in memory.
+
+    Ownership of every ``task_id`` is checked with one query. Returns
+    ``(tasks, errors)`` in the same shape as ``build_tasks``.
+    """
+    requested_ids = [_as_id(row.get("task_id")) for row in rows]
+    owned = Task.objects.filter(
+        pk__in={pk for pk in requested_ids if pk is not None}, assigned_to=user
+    ).only("id", "assigned_to_id", "created_at", *UPDATE_FIELDS).in_bulk()
+
+    now = timezone.now()
+    tasks, errors, seen = [], {}, set()
+    for index, (row, task_id) in enumerate(zip(rows, requested_ids)):
+        row_errors = []
+        task = owned.get(task_id)
+        new_status = row.get("status") or "completed"
+        hours = row.get("worked_hours")
+        report = row.get("completion_report")
+
+        if task is None:
+            row_errors.append("task_id must be one of your tasks")
+        elif task_id in seen:
+            row_errors.append("task_id appears more than once")
+        if new_status not in UPDATABLE_STATUSES:
+            row_errors.append(f"status must be one of {', '.join(UPDATABLE_STATUSES)}")
+        if hours not in (None, ""):
+            hours = _as_hours(hours)
+            if hours is None:
+                row_errors.append("worked_hours must be a number between 0 and 9999.99")
+        elif new_status == "completed" and task is not None and task.worked_hours is None:
+            row_errors.append("worked_hours is required to complete a task")
+        if report is not None and not isinstance(report, str):
+            row_errors.append("completion_report must be a string")
+
+        seen.add(task_id)
+        if row_errors:
+            errors[index] = row_errors
+            continue
+        task._previous_state = snapshot(task)
+        task.status = new_status
+        if hours not in (None, ""):
+            task.worked_hours = hours
+        if report is not None:
+            task.completion_report = report
+        task.updated_at = now
+        tasks.append(task)
+    return tasks, errors
+
+
+def apply_task_updates(tasks, user):
+    with transaction.atomic():
+        Task.objects.bulk_update(tasks, UPDATE_FIELDS, batch_size=BULK_BATCH_SIZE)
+        record_tasks(tasks, {task.pk: task._previous_state for task in tasks})
+        index_task_ids([task.pk for task in tasks])
+        publish_tasks(tasks)
+    invalidate_summaries(user_ids=[user.pk], admin_ids=[user.assigned_admin_id])
+    return tasks
+
+
+# ---------------- SET-BASED UPDATES ---------------- #
+
+def update_tasks(tasks, **changes):
+    """
+    Apply ``changes`` to every task in ``tasks`` with a single UPDATE.
+
+    ``QuerySet.update()`` sends no save signals, so the rollups,
+    tombstones, events and summaries they maintain are updated here from
+    the rows loaded beforehand. Returns the number of tasks updated.
+    """
+    with transaction.atomic():
+        loaded = list(tasks.order_by().only(*TRACKED_FIELDS))
+        if not loaded:
+            return 0
+        changes["updated_at"] = timezone.now()
+        Task.objects.filter(pk__in=[task.pk for task in loaded]).update(**changes)
+        previous = {}
+        for task in loaded:
+            previous[task.pk] = task._previous_state = snapshot(task)
+            for field, value in changes.items():
+                setattr(task, field, value)
+        record_tasks(loaded, previous)
+        record_tombstones([
+            (task.pk, previous[task.pk][0])
+            for task in loaded
+            if previous[task.pk][0] != task.assigned_to_id
+        ])
+        publish_tasks(loaded)
+    user_ids = {state[0] for state in previous.values()} | {task.assigned_to_id for task in loaded}
+    invalidate_summaries(
+        user_ids=user_ids,
+        admin_ids=CustomUser.objects.filter(pk__in=user_ids).values_list(
+            "assigned_admin_id", flat=True
+        ),
+    )
+    return len(loaded)
+
+
+def complete_tasks(tasks):
+    return update_tasks(tasks.exclude(status="completed"), status="completed")
+
+
+def reassign_tasks(tasks, assignee):
+    return update_tasks(tasks.exclude(assigned_to=assignee), assigned_to_id=assignee.pk)
+
+
+# ---------------- SET-BASED DELETES ---------------- #
+
+def delete_tasks(tasks):
+    """
+    Delete every task in ``tasks`` with a single DELETE.
+
+    This skips Django's collector, which would load each task and send
+    post_delete for it, so the rollups, tombstones, search index and
+    summaries are updated here instead. Returns the number deleted.
+    """
+    with transaction.atomic():
+        loaded = list(tasks.order_by().only(*TRACKED_FIELDS))
+        if not loaded:
+            return 0
+        ids = [task.pk for task in loaded]
+        # No foreign key points at Task, so the raw delete skips no cascade.
+        Task.objects.filter(pk__in=ids)._raw_delete(Task.objects.db)
+        apply_deltas(
+            merge_deltas(deltas_between(snapshot(task), None) for task in loaded), create=False
+        )
+        record_tombstones([(task.pk, task.assigned_to_id) for task in loaded])
+        unindex_task_ids(ids)
+    user_ids = {task.assigned_to_id for task in loaded}
+    invalidate_summaries(
+        user_ids=user_ids,
+        admin_ids=CustomUser.objects.filter(pk__in=user_ids).values_list(
+            "assigned_admin_id", flat=True
+        ),
+    )
+    return len(loaded)
+
+
+def release_assigned_users(admin, reassign_to=None):
+    """
+    Move every user assigned to ``admin`` to ``reassign_to``, or leave them
+    unassigned, with one UPDATE. Returns the number of users moved.
+    """
+    users = CustomUser.objects.filter(assigned_admin=admin)
+    user_ids = list(users.values_list("pk", flat=True))
+    if not user_ids:
+        return 0
+    new_admin_id = reassign_to.pk if reassign_to else None
+    with transaction.atomic():
+        # assigned_admin is a token claim, so this also revokes their JWTs.
+        users.update(assigned_admin_id=new_admin_id, token_version=F("token_version") + 1)
+        TaskRollup.objects.filter(admin=admin).update(admin_id=new_admin_id)
+        record_scope_change(user_ids, admin.pk, new_admin_id)
+    cache.delete_many(
+        [token_version_cache_key(pk) for pk in user_ids]
+        + [managed_users_cache_key(pk) for pk in (admin.pk, new_admin_id) if pk]
+    )
+    invalidate_summaries(user_ids=user_ids, admin_ids=[admin.pk, new_admin_id])
+    return len(user_ids)
+
+
+def delete_account(account, reassign_to=None, batch_size=BULK_BATCH_SIZE, progress=None):
+    """
+    Delete ``account`` without loading its tasks into memory at once.
+
+    Its tasks (assigned to it or created by it) go ``batch_size`` at a time,
+    one short transaction each, with ``progress(done, total)`` called after
+    every batch. Its assigned users are then released in one UPDATE, which
+    leaves the final ``account.delete()`` only rows without signals (archived
+    tasks, rollups) to cascade over, each table in a single DELETE.
+    """
+    owned = (Task.objects.filter(assigned_to=account), Task.objects.filter(created_by=account))
+    total = sum(tasks.count() for tasks in owned)
+    deleted = 0
+    if progress:
+        progress(deleted, total)
+    # One foreign key at a time, so each batch is a plain index range.
+    for tasks in owned:
+        while True:
+            batch = list(tasks.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            deleted += delete_tasks(Task.objects.filter(pk__in=batch))
+            if progress:
+                progress(deleted, total)
+    released = release_assigned_users(account, reassign_to)
+    account.delete()
+    return {"tasks_deleted": deleted, "users_released": released}
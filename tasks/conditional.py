@@ -0,0 +1,55 @@
+# tasks/conditional.py
+
+from calendar import timegm
+from hashlib import md5
+
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def collection_validators(request, tasks):
+    """
+    ETag and Last-Modified for a task collection, from one aggregate.
+
+    ``MAX(updated_at)`` moves on every insert or edit and the row count on
+    every delete or reassignment out of scope, so together they change
+    whenever the collection does. The ETag also covers who is asking and
+    how (format, cursor, page size). Last-Modified has one-second
+    resolution and cannot see deletes, so clients should prefer the ETag.
+    """
+    state = tasks.order_by().aggregate(last_modified=Max("updated_at"), count=Count("id"))
+    renderer = getattr(request, "accepted_renderer", None)
+    parts = (
+        request.user.pk,
+        request.user.role,
+        renderer.format if renderer else "",
+        request.get_full_path(),
+        state["count"],
+        state["last_modified"].isoformat() if state["last_modified"] else "",
+    )
+    etag = 'W/"%s"' % md5(":".join(map(str, parts)).encode(), usedforsecurity=False).hexdigest()
+    last_modified = state["last_modified"]
+    return etag, timegm(last_modified.utctimetuple()) if last_modified else None
+
+
+def conditional_response(request, tasks, build_response):
+    """
+    Answer 304 Not Modified when the client's validators still match
+    ``tasks``; otherwise return ``build_response()`` with fresh validators.
+    """
+    etag, last_modified = collection_validators(request, tasks)
+    # A 304 would leave queued flash messages for whatever page comes next.
+    response = None if len(get_messages(request)) else get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = build_response()
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Revalidate on every poll, and never share one user's collection.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Accept", "Authorization", "Cookie"))
+    return response
@@ -0,0 +1,154 @@
+# tasks/events.py
+
+import asyncio
+import itertools
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+from .models import CustomUser
+
+SSE_QUEUE_SIZE = getattr(settings, "TASKS_SSE_QUEUE_SIZE", 100)
+SSE_KEEPALIVE_SECONDS = getattr(settings, "TASKS_SSE_KEEPALIVE_SECONDS", 15)
+EVENT_FIELDS = (
+    "id", "title", "assigned_to_id", "created_by_id", "due_date",
+    "status", "worked_hours", "created_at", "updated_at",
+)
+
+# Queued in place of further events once a subscriber falls too far behind.
+OVERFLOW = object()
+OVERFLOW_MESSAGE = (
+    'event: overflow\ndata: {"detail": "Too far behind; resync via /api/tasks/changes/"}\n\n'
+)
+
+
+# ---------------- BROKER ---------------- #
+
+class Subscription:
+    """One open event stream: a bounded queue on the event loop serving it."""
+
+    def __init__(self, user, loop, maxsize):
+        self.role = user.role
+        self.user_id = user.pk
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def wants(self, event):
+        if self.role == "superadmin":
+            return True
+        if self.role == "admin":
+            return event["admin_id"] == self.user_id
+        return event["task"]["assigned_to_id"] == self.user_id
+
+    def deliver(self, event):
+        # Runs on self.loop. A client that cannot keep up is cut off with an
+        # overflow notice rather than buffering without bound.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class EventBroker:
+    """In-process pub/sub between the ORM threads and the SSE streams."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._ids = itertools.count(1)
+
+    def has_subscribers(self):
+        return bool(self._subscriptions)
+
+    def subscribe(self, user, maxsize=SSE_QUEUE_SIZE):
+        subscription = Subscription(user, asyncio.get_running_loop(), maxsize)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, events):
+        """Hand ``events`` to every matching subscriber; safe from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for event in events:
+            event = {**event, "event_id": next(self._ids)}
+            for subscription in subscriptions:
+                if not subscription.wants(event):
+                    continue
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+                except RuntimeError:
+                    # The stream's event loop has shut down.
+                    self.unsubscribe(subscription)
+
+
+broker = EventBroker()
+
+
+# ---------------- PUBLISHING ---------------- #
+
+def _kind(task, created):
+    if created:
+        return "created"
+    previous = getattr(task, "_previous_state", None)
+    if task.status == "completed" and previous and previous[1] != "completed":
+        return "completed"
+    return "updated"
+
+
+def publish_tasks(tasks, created=False):
+    """
+    Queue task events for the open streams once the current transaction
+    commits. Costs nothing while nobody is subscribed.
+    """
+    if not broker.has_subscribers() or not tasks:
+        return
+    admin_ids = dict(
+        CustomUser.objects.filter(pk__in={task.assigned_to_id for task in tasks})
+        .values_list("id", "assigned_admin_id")
+    )
+    events = [
+        {
+            "kind": _kind(task, created),
+            "admin_id": admin_ids.get(task.assigned_to_id),
+            "task": {field: getattr(task, field) for field in EVENT_FIELDS},
+        }
+        for task in tasks
+    ]
+    transaction.on_commit(lambda: broker.publish(events))
+
+
+def encode_event(event):
+    data = json.dumps(event["task"], cls=JSONEncoder)
+    return f"id: {event['event_id']}\nevent: {event['kind']}\ndata: {data}\n\n"
+
+
+async def event_stream(subscription, keepalive=SSE_KEEPALIVE_SECONDS):
+    """Server-sent events for ``subscription`` until the client goes away."""
+    try:
+        yield "retry: 5000\n: connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                # Comment lines keep proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            if event is OVERFLOW:
+                yield OVERFLOW_MESSAGE
+                return
+            yield encode_event(event)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,142 @@
+# tasks/exports.py
+
+import csv
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .archive import reaches_archive
+from .models import ArchivedTask, Task
+
+EXPORT_CHUNK_SIZE = getattr(settings, "TASKS_EXPORT_CHUNK_SIZE", 2000)
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_FILTER_PARAMS = ("from", "to", "admin")
+EXPORT_FIELDS = (
+    "id", "title", "assigned_to_id", "assigned_to__username",
+    "assigned_to__assigned_admin_id", "status", "worked_hours",
+    "due_date", "created_at", "updated_at",
+)
+
+
+class ExportFilterError(ValueError):
+    pass
+
+
+class Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def _day_start(value, name):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        # Well formed but impossible, such as 2026-02-30.
+        day = None
+    if day is None:
+        raise ExportFilterError(f"{name} must be a YYYY-MM-DD date")
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def completion_filters(user, params):
+    """
+    ``from``/``to`` (inclusive completion dates) and, for superadmins,
+    ``admin`` as a Q that applies to live and archived tasks alike, plus
+    the start of the range (None when open-ended).
+    """
+    filters = Q()
+    start = None
+    if params.get("from"):
+        start = _day_start(params["from"], "from")
+        filters &= Q(updated_at__gte=start)
+    if params.get("to"):
+        end = _day_start(params["to"], "to") + timedelta(days=1)
+        filters &= Q(updated_at__lt=end)
+    if params.get("admin") and user.role == "superadmin":
+        try:
+            admin_id = int(params["admin"])
+        except ValueError:
+            raise ExportFilterError("admin must be a user id")
+        filters &= Q(assigned_to__assigned_admin_id=admin_id)
+    return filters, start
+
+
+def completed_tasks(user, params):
+    """
+    Completed tasks in the user's scope narrowed by ``params``, as
+    ``(tasks, archived)``. ``archived`` is None unless the range reaches
+    back into the archive, so recent reports never touch that table.
+    """
+    filters, start = completion_filters(user, params)
+    tasks = Task.objects.for_user(user).filter(filters, status="completed")
+    if not reaches_archive(start):
+        return tasks, None
+    return tasks, ArchivedTask.objects.for_user(user).filter(filters)
+
+
+def completed_tasks_for_export(user, params):
+    """``completed_tasks`` as one queryset in completion order, archive included."""
+    tasks, archived = completed_tasks(user, params)
+    if archived is not None:
+        # UNION needs the same columns on both sides.
+        tasks = tasks.order_by().values(*EXPORT_FIELDS).union(
+            archived.order_by().values(*EXPORT_FIELDS), all=True
+        )
+    return tasks.order_by("updated_at", "id")
+
+
+def _rows(tasks):
+    return tasks.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _arows(tasks):
+    # values_list() executes as soon as iteration starts, before aiterator()
+    # can move it off the event loop; values() rows are produced lazily.
+    return tasks.values(*EXPORT_FIELDS).aiterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(tasks):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in _rows(tasks):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(tasks):
+    encoder = DjangoJSONEncoder()
+    for row in _rows(tasks):
+        yield encoder.encode(dict(zip(EXPORT_FIELDS, row))) + "\n"
+
+
+async def astream_csv(tasks):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    async for row in _arows(tasks):
+        yield writer.writerow(row.values())
+
+
+async def astream_ndjson(tasks):
+    encoder = DjangoJSONEncoder()
+    async for row in _arows(tasks):
+        yield encoder.encode(row) + "\n"
+
+
+def export_response(tasks, export_format, asynchronous=False):
+    """Stream ``tasks``; async views pass ``asynchronous=True`` to read via ``aiterator``."""
+    stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+    if export_format == "csv":
+        stream = astream_csv if asynchronous else stream_csv
+        response = StreamingHttpResponse(stream(tasks), content_type="text/csv")
+    else:
+        stream = astream_ndjson if asynchronous else stream_ndjson
+        response = StreamingHttpResponse(stream(tasks), content_type="application/x-ndjson")
+    response["Content-Disposition"] = (
+        f'attachment; filename="task-report-{stamp}.{export_format}"'
+    )
+    return response
@@ -0,0 +1,223 @@
+# tasks/jobs.py
+
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .archive import archive_tasks
+from .bulk import delete_account
+from .exports import EXPORT_FORMATS, completed_tasks_for_export, stream_csv, stream_ndjson
+from .models import CustomUser, Job
+from .rollups import rebuild_rollups
+from .search import rebuild_search_index
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = getattr(settings, "TASKS_JOB_MAX_ATTEMPTS", 3)
+JOB_RETRY_DELAY_SECONDS = getattr(settings, "TASKS_JOB_RETRY_DELAY_SECONDS", 30)
+JOB_TIMEOUT_SECONDS = getattr(settings, "TASKS_JOB_TIMEOUT_SECONDS", 3600)
+JOB_BATCH_SIZE = getattr(settings, "TASKS_JOB_BATCH_SIZE", 500)
+JOB_EXPORT_DIR = Path(getattr(settings, "TASKS_JOB_EXPORT_DIR", settings.BASE_DIR / "exports"))
+JOB_EAGER = getattr(settings, "TASKS_JOB_EAGER", False)
+ACTIVE_STATUSES = ("queued", "running")
+
+HANDLERS = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help."""
+
+
+def job_handler(kind):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+# ---------------- QUEUE ---------------- #
+
+def enqueue(kind, payload=None, user_id=None, max_attempts=JOB_MAX_ATTEMPTS):
+    """
+    Queue a ``kind`` job for the workers. With ``TASKS_JOB_EAGER`` it runs
+    in this process instead, once the current transaction commits.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job.objects.create(
+        kind=kind, payload=payload or {}, created_by_id=user_id, max_attempts=max_attempts
+    )
+    if JOB_EAGER:
+        transaction.on_commit(lambda: run_job(claim_job("eager", pk=job.pk)))
+    return job
+
+
+def active_job(kind, **payload):
+    """The queued or running ``kind`` job whose payload matches, if any."""
+    lookups = {f"payload__{key}": value for key, value in payload.items()}
+    return Job.objects.filter(kind=kind, status__in=ACTIVE_STATUSES, **lookups).first()
+
+
+def claim_job(worker_id, pk=None):
+    """
+    Atomically take the oldest due job (or job ``pk``) for ``worker_id``.
+    The status check in the UPDATE makes concurrent workers skip jobs
+    another one claimed first. Returns None when nothing is due.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(status="queued", run_after__lte=now)
+    if pk is not None:
+        due = due.filter(pk=pk)
+    for candidate in due.order_by("run_after", "id").values_list("id", flat=True)[:10]:
+        claimed = Job.objects.filter(pk=candidate, status="queued").update(
+            status="running",
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=candidate)
+    return None
+
+
+def requeue_stale_jobs():
+    """
+    Recover jobs whose worker died: running jobs that have not reported
+    progress within ``TASKS_JOB_TIMEOUT_SECONDS`` are retried, or failed
+    once out of attempts.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status="running", locked_at__lt=now - timedelta(seconds=JOB_TIMEOUT_SECONDS)
+    )
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status="failed", error="Worker stopped responding", finished_at=now, updated_at=now
+    )
+    requeued = stale.update(
+        status="queued", locked_by="", locked_at=None, run_after=now, updated_at=now
+    )
+    return requeued + failed
+
+
+def report_progress(job, done, total=None):
+    """Record progress; it also tells requeue_stale_jobs() the worker is alive."""
+    now = timezone.now()
+    changes = {"progress_done": done, "locked_at": now, "updated_at": now}
+    if total is not None:
+        changes["progress_total"] = total
+    Job.objects.filter(pk=job.pk).update(**changes)
+
+
+def run_job(job):
+    """Run a claimed job, then mark it succeeded, due for retry or failed."""
+    if job is None:
+        return None
+    now = timezone.now
+    try:
+        handler = HANDLERS.get(job.kind)
+        if handler is None:
+            raise PermanentJobError(f"Unknown job kind: {job.kind}")
+        result = handler(job)
+    except Exception as e:
+        logger.exception("Job %s (%s) failed on attempt %s", job.pk, job.kind, job.attempts)
+        changes = {"error": f"{type(e).__name__}: {e}", "locked_by": "", "locked_at": None}
+        if isinstance(e, PermanentJobError) or job.attempts >= job.max_attempts:
+            changes.update(status="failed", finished_at=now())
+        else:
+            # 30s, 60s, 120s, ... with the default delay.
+            delay = JOB_RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            changes.update(status="queued", run_after=now() + timedelta(seconds=delay))
+    else:
+        changes = {
+            "status": "succeeded", "result": result, "error": "",
+            "locked_by": "", "locked_at": None, "finished_at": now(),
+        }
+    Job.objects.filter(pk=job.pk).update(updated_at=now(), **changes)
+    job.refresh_from_db()
+    return job
+
+
+# ---------------- HANDLERS ---------------- #
+
+def _delete_account(job, role):
+    account = CustomUser.objects.filter(pk=job.payload["user_id"], role=role).first()
+    if account is None:
+        # Already gone, e.g. deleted by an earlier attempt.
+        return {"deleted": False, "tasks_deleted": 0, "users_released": 0}
+    reassign_to = None
+    if job.payload.get("reassign_to"):
+        # Gone by now? Its users are left unassigned instead.
+        reassign_to = CustomUser.objects.filter(
+            pk=job.payload["reassign_to"], role="admin"
+        ).first()
+    result = delete_account(
+        account,
+        reassign_to,
+        batch_size=JOB_BATCH_SIZE,
+        progress=lambda done, total: report_progress(job, done, total),
+    )
+    return {"deleted": True, **result}
+
+
+@job_handler("delete_user")
+def delete_user(job):
+    return _delete_account(job, "user")
+
+
+@job_handler("delete_admin")
+def delete_admin(job):
+    return _delete_account(job, "admin")
+
+
+@job_handler("archive_tasks")
+def archive_tasks_job(job):
+    moved = archive_tasks(progress=lambda done, total: report_progress(job, done, total))
+    return {"archived": moved}
+
+
+@job_handler("rebuild_rollups")
+def rebuild_rollups_job(job):
+    return {"buckets": rebuild_rollups()}
+
+
+@job_handler("rebuild_search_index")
+def rebuild_search_index_job(job):
+    return {"indexed": rebuild_search_index()}
+
+
+def export_path(job):
+    return JOB_EXPORT_DIR / f"task-report-{job.pk}.{job.payload['format']}"
+
+
+@job_handler("export_tasks")
+def export_tasks(job):
+    export_format = job.payload.get("format")
+    if export_format not in EXPORT_FORMATS or job.created_by is None:
+        raise PermanentJobError("Nothing to export")
+    tasks = completed_tasks_for_export(job.created_by, job.payload.get("params", {}))
+    total = tasks.count()
+    report_progress(job, 0, total)
+    stream = stream_csv if export_format == "csv" else stream_ndjson
+
+    path = export_path(job)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(path.suffix + ".part")
+    rows = 0
+    with open(partial, "w", encoding="utf-8", newline="") as output:
+        for line in stream(tasks):
+            output.write(line)
+            rows += 1
+            if rows % JOB_BATCH_SIZE == 0:
+                report_progress(job, rows, total)
+    # Only a complete file ever appears under the final name.
+    os.replace(partial, path)
+    # The CSV header is not a task.
+    tasks_written = rows - 1 if export_format == "csv" else rows
+    report_progress(job, tasks_written, total)
+    return {"file": path.name, "rows": tasks_written}
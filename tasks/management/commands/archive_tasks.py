@@ -0,0 +1,24 @@
+# tasks/management/commands/archive_tasks.py
+
+from django.core.management.base import BaseCommand
+from tasks.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed tasks untouched for --days days from the task table to "
+        "the archive table in batches. Reports and exports still include them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        moved = archive_tasks(
+            days=options["days"], batch_size=options["batch_size"], progress=self.progress
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} tasks"))
+
+    def progress(self, done, total):
+        self.stdout.write(f"  {done}/{total} tasks archived")
@@ -0,0 +1,121 @@
+# tasks/management/commands/benchmark_archive.py
+
+from datetime import timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from tasks.archive import archive_tasks
+from tasks.exports import completed_tasks_for_export
+from tasks.models import ArchivedTask, CustomUser, Task
+from tasks.seed import seed_dataset
+
+PREFIX = "archbench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate the task table growing over several periods, once keeping "
+        "every task live and once archiving old completed tasks after each "
+        "period, and time the hot-table queries after every period. "
+        "Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--periods", type=int, default=4)
+        parser.add_argument("--period-days", type=int, default=180)
+        parser.add_argument("--archive-days", type=int, default=90)
+        parser.add_argument("--admins", type=int, default=5)
+        parser.add_argument("--users-per-admin", type=int, default=20)
+        parser.add_argument("--tasks-per-user", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=50)
+
+    def handle(self, *args, **options):
+        results = {}
+        for archived in (False, True):
+            label = "with archival" if archived else "without archival"
+            self.stdout.write(self.style.MIGRATE_HEADING(f"=== {label} ==="))
+            with transaction.atomic():
+                results[archived] = [
+                    self.run_period(period, archived, options)
+                    for period in range(options["periods"])
+                ]
+                transaction.set_rollback(True)
+        self.report(results)
+
+    def run_period(self, period, archived, options):
+        days = options["period_days"]
+        if period:
+            # Let a period pass: everything seeded so far gets older.
+            age = timedelta(days=days)
+            for model in (Task, ArchivedTask):
+                model.objects.update(
+                    created_at=F("created_at") - age, updated_at=F("updated_at") - age
+                )
+        seed_dataset(
+            admins=options["admins"],
+            users_per_admin=options["users_per_admin"],
+            tasks_per_user=options["tasks_per_user"],
+            prefix=f"{PREFIX}{period}",
+            days=days,
+        )
+        # Old work gets finished eventually, which is what makes it archivable.
+        cutoff = timezone.now() - timedelta(days=options["archive_days"])
+        Task.objects.filter(created_at__lt=cutoff).exclude(status="completed").update(
+            status="completed", worked_hours=1, updated_at=F("created_at")
+        )
+        if archived:
+            moved = archive_tasks(days=options["archive_days"])
+            self.stdout.write(f"period {period + 1}: archived {moved} tasks")
+        if connection.vendor in ("sqlite", "postgresql"):
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        row = {
+            "live": Task.objects.count(),
+            "total": Task.objects.count() + ArchivedTask.objects.count(),
+        }
+        for name, query in self.build_queries(period, options["page_size"]).items():
+            started = perf_counter()
+            for _ in range(options["repeat"]):
+                query()
+            row[name] = (perf_counter() - started) * 1000 / options["repeat"]
+        return row
+
+    def build_queries(self, period, page_size):
+        superadmin = CustomUser.objects.get(username=f"{PREFIX}{period}_superadmin")
+        # The newest admin's scope is the same size in every period.
+        admin = CustomUser.objects.get(username=f"{PREFIX}{period}_admin0")
+        tasks = Task.objects.order_by("-created_at", "-id")
+        recent = {"from": (timezone.localdate() - timedelta(days=30)).isoformat()}
+        return {
+            "superadmin task page": lambda: list(tasks[:page_size]),
+            "superadmin counters": lambda: Task.objects.aggregate(
+                total=Count("id"), completed=Count("id", filter=Q(status="completed"))
+            ),
+            "admin task page": lambda: list(
+                tasks.filter(assigned_to__assigned_admin=admin)[:page_size]
+            ),
+            "completed report page": lambda: list(tasks.filter(status="completed")[:page_size]),
+            "30-day export": lambda: list(
+                completed_tasks_for_export(superadmin, recent).values_list("id", flat=True)
+            ),
+        }
+
+    def report(self, results):
+        names = [name for name in results[False][0] if name not in ("live", "total")]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{'period':<7} {'tasks':>8} {'live rows':>19}"
+            + "".join(f" {name:>24}" for name in names)
+        ))
+        for period, (before, after) in enumerate(zip(results[False], results[True]), 1):
+            timings = "".join(
+                f" {before[name]:>9.2f} -> {after[name]:>6.2f} ms" for name in names
+            )
+            self.stdout.write(
+                f"{period:<7} {before['total']:>8} {before['live']:>8} -> {after['live']:>7}"
+                + timings
+            )
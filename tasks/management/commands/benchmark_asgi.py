@@ -0,0 +1,171 @@
+# tasks/management/commands/benchmark_asgi.py
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from tasks.authentication import RoleTokenObtainPairSerializer
+from tasks.management.commands.benchmark_routes import percentile
+from tasks.models import CustomUser
+from tasks.seed import seed_dataset
+
+PREFIX = "asgibench"
+# Each sync endpoint next to its async counterpart.
+ROUTES = (
+    ("dashboard", "async_dashboard"),
+    ("task_list_view", "async_task_list"),
+    ("task_report_view", "async_task_report"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare request concurrency of the sync (WSGI) read endpoints, served "
+        "by a fixed pool of worker threads, against their async (ASGI) "
+        "counterparts, served by one event loop. Use --db-latency-ms to stand "
+        "in for a networked database. Seeds its own accounts and deletes them "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--admins", type=int, default=2)
+        parser.add_argument("--users-per-admin", type=int, default=10)
+        parser.add_argument("--tasks-per-user", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per route and mode.")
+        parser.add_argument(
+            "--concurrency", type=int, default=50, help="Requests in flight at once."
+        )
+        parser.add_argument(
+            "--wsgi-workers", type=int, default=8,
+            help="Worker threads serving the sync endpoints, as a WSGI server would.",
+        )
+        parser.add_argument(
+            "--db-latency-ms", type=float, default=0.0,
+            help="Delay added to every query to simulate a database round trip.",
+        )
+
+    def handle(self, *args, **options):
+        if settings.DATABASES["default"]["NAME"] == ":memory:":
+            raise CommandError("Worker threads need a database file, not an in-memory database.")
+        if CustomUser.objects.filter(username__startswith=f"{PREFIX}_").exists():
+            self.cleanup()
+        seed_dataset(
+            admins=options["admins"],
+            users_per_admin=options["users_per_admin"],
+            tasks_per_user=options["tasks_per_user"],
+            prefix=PREFIX,
+        )
+        admin = CustomUser.objects.get(username=f"{PREFIX}_admin0")
+        token = str(RoleTokenObtainPairSerializer.get_token(admin).access_token)
+        self.authorization = f"Bearer {token}"
+
+        latency = options["db_latency_ms"] / 1000
+        if latency:
+            delay = self.add_latency(latency)
+        results = []
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                for sync_name, async_name in ROUTES:
+                    results.append(("wsgi", sync_name, self.run_wsgi(reverse(sync_name), options)))
+                    results.append(("asgi", async_name, self.run_asgi(reverse(async_name), options)))
+        finally:
+            if latency:
+                connection_created.disconnect(dispatch_uid=PREFIX)
+                for conn in connections.all():
+                    conn.execute_wrappers.remove(delay)
+            self.cleanup()
+        self.report(results, options)
+
+    # ---------------- MEASUREMENT ---------------- #
+
+    def add_latency(self, seconds):
+        def delay(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            # First in line: execute_wrapper() blocks pop the last entry on exit.
+            connection.execute_wrappers.insert(0, delay)
+
+        # Worker threads open their own connections; give each one the delay.
+        connection_created.connect(install, weak=False, dispatch_uid=PREFIX)
+        for conn in connections.all():
+            conn.execute_wrappers.insert(0, delay)
+        return delay
+
+    def run_wsgi(self, url, options):
+        def call(_):
+            client = Client(HTTP_ACCEPT="application/json", HTTP_AUTHORIZATION=self.authorization)
+            started = perf_counter()
+            response = client.get(url)
+            return response.status_code, (perf_counter() - started) * 1000
+
+        call(None)
+        # More workers than --concurrency would never be busy at once.
+        workers = min(options["wsgi_workers"], options["concurrency"])
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(call, range(options["requests"])))
+        return self.summarise(outcomes, perf_counter() - started)
+
+    def run_asgi(self, url, options):
+        headers = {"Authorization": self.authorization}
+
+        async def call(client, limit):
+            async with limit:
+                # The ASGI handler gives every request its own sync thread.
+                async with ThreadSensitiveContext():
+                    started = perf_counter()
+                    response = await client.get(url, headers=headers)
+                    return response.status_code, (perf_counter() - started) * 1000
+
+        async def run():
+            client = AsyncClient()
+            limit = asyncio.Semaphore(options["concurrency"])
+            await call(client, limit)
+            started = perf_counter()
+            outcomes = await asyncio.gather(
+                *(call(client, limit) for _ in range(options["requests"]))
+            )
+            return outcomes, perf_counter() - started
+
+        outcomes, elapsed = asyncio.run(run())
+        return self.summarise(outcomes, elapsed)
+
+    def summarise(self, outcomes, elapsed):
+        timings = [ms for _, ms in outcomes]
+        return {
+            "errors": sum(1 for code, _ in outcomes if code != 200),
+            "throughput": len(outcomes) / elapsed,
+            "p50_ms": statistics.median(timings),
+            "p95_ms": percentile(timings, 0.95),
+        }
+
+    # ---------------- REPORTING ---------------- #
+
+    def report(self, results, options):
+        self.stdout.write(
+            f"\n{options['requests']} requests per route, {options['concurrency']} in flight, "
+            f"{min(options['wsgi_workers'], options['concurrency'])} WSGI workers, "
+            f"{options['db_latency_ms']:g} ms added per query"
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'mode':<6} {'route':<20} {'errors':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}"
+        ))
+        for mode, name, row in results:
+            self.stdout.write(
+                f"{mode:<6} {name:<20} {row['errors']:>6} {row['throughput']:>9.1f} "
+                f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f}"
+            )
+
+    def cleanup(self):
+        CustomUser.objects.filter(username__startswith=f"{PREFIX}_").delete()
@@ -0,0 +1,112 @@
+# tasks/management/commands/benchmark_indexes.py
+
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from tasks.models import CustomUser, Task
+from tasks.seed import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset inside a transaction, then report EXPLAIN plans "
+        "and timings for the role-scoped queries with and without the custom "
+        "indexes. Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--admins", type=int, default=20)
+        parser.add_argument("--users-per-admin", type=int, default=25)
+        parser.add_argument("--tasks-per-user", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = seed_dataset(
+                admins=options["admins"],
+                users_per_admin=options["users_per_admin"],
+                tasks_per_user=options["tasks_per_user"],
+                prefix="bench",
+            )
+            self.stdout.write(
+                f"Seeded {counts['admins']} admins, {counts['users']} users, "
+                f"{counts['tasks']} tasks"
+            )
+            queries = self.build_queries(options["page_size"])
+            indexes = self.custom_indexes()
+
+            self.apply_index_sql(indexes, "remove_sql")
+            self.analyze()
+            before = self.run_queries(queries, options["repeat"], "without indexes")
+
+            self.apply_index_sql(indexes, "create_sql")
+            self.analyze()
+            after = self.run_queries(queries, options["repeat"], "with indexes")
+
+            self.stdout.write(self.style.MIGRATE_HEADING("\nSummary (ms per query)"))
+            for name in queries:
+                self.stdout.write(
+                    f"  {name:<28} {before[name]:>9.3f} -> {after[name]:>9.3f}"
+                )
+            transaction.set_rollback(True)
+
+    def custom_indexes(self):
+        return [
+            (model, index)
+            for model in (CustomUser, Task)
+            for index in model._meta.indexes
+        ]
+
+    def apply_index_sql(self, indexes, method):
+        # Raw DDL rather than schema_editor(), which SQLite refuses to open
+        # inside the surrounding atomic block.
+        editor = connection.schema_editor()
+        editor.deferred_sql = []
+        with connection.cursor() as cursor:
+            for model, index in indexes:
+                cursor.execute(str(getattr(index, method)(model, editor)))
+
+    def build_queries(self, page_size):
+        admin = CustomUser.objects.filter(role="admin", username__startswith="bench_").first()
+        user = CustomUser.objects.filter(role="user", assigned_admin=admin).first()
+        tasks = Task.objects.order_by("-created_at", "-id")
+        return {
+            "user task page": tasks.filter(assigned_to=user)[:page_size],
+            "user completed count": Task.objects.filter(assigned_to=user, status="completed"),
+            "admin task page": tasks.filter(assigned_to__assigned_admin=admin)[:page_size],
+            "admin counters": Task.objects.filter(assigned_to__assigned_admin=admin),
+            "superadmin task page": tasks[:page_size],
+            "completed report page": tasks.filter(status="completed")[:page_size],
+            "user list page": CustomUser.objects.filter(role="user")
+            .order_by("-date_joined", "-id")[:page_size],
+            "admin user count": CustomUser.objects.filter(assigned_admin=admin),
+        }
+
+    def analyze(self):
+        if connection.vendor in ("sqlite", "postgresql"):
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def run_query(self, name, queryset):
+        if name.endswith("counters"):
+            return queryset.aggregate(
+                total=Count("id"), completed=Count("id", filter=Q(status="completed"))
+            )
+        if name.endswith("count"):
+            return queryset.count()
+        return list(queryset.all())
+
+    def run_queries(self, queries, repeat, label):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {label} ==="))
+        timings = {}
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.SUCCESS(name))
+            self.stdout.write(queryset.explain())
+            started = perf_counter()
+            for _ in range(repeat):
+                self.run_query(name, queryset)
+            timings[name] = (perf_counter() - started) * 1000 / repeat
+        return timings
@@ -0,0 +1,173 @@
+# tasks/management/commands/benchmark_routes.py
+
+import json
+import math
+import statistics
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tasks.models import CustomUser, Task
+from tasks.rollups import rebuild_rollups
+from tasks.seed import seed_dataset
+from tasks.urls import urlpatterns
+
+ROLES = ("superadmin", "admin", "user")
+# Routes that would end the session or destroy the data being measured.
+SKIPPED_ROUTES = {
+    "logout": "ends the session",
+    "user_delete": "destructive",
+    "admin_delete": "destructive",
+}
+ACCEPT = {"html": "text/html", "json": "application/json"}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every GET route in tasks/urls.py through the test client as each "
+        "role against a seeded dataset, report p50/p95 latency, query count and "
+        "peak memory, and fail when a route regresses beyond the stored baseline. "
+        "The seeded data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--admins", type=int, default=5)
+        parser.add_argument("--users-per-admin", type=int, default=20)
+        parser.add_argument("--tasks-per-user", type=int, default=50)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--format", choices=sorted(ACCEPT), default="html")
+        parser.add_argument(
+            "--baseline",
+            default=str(Path(settings.BASE_DIR) / "bench_baseline.json"),
+            help="JSON file holding the reference measurements.",
+        )
+        parser.add_argument(
+            "--save-baseline", action="store_true", help="Write this run's results as the baseline."
+        )
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed fractional p95 slowdown before a route counts as regressed.",
+        )
+        parser.add_argument(
+            "--min-delta-ms", type=float, default=2.0,
+            help="Ignore p95 slowdowns smaller than this many milliseconds.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            seed_dataset(
+                admins=options["admins"],
+                users_per_admin=options["users_per_admin"],
+                tasks_per_user=options["tasks_per_user"],
+                prefix="routebench",
+            )
+            rebuild_rollups()
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                results = self.run_routes(options)
+            transaction.set_rollback(True)
+
+        self.report(results)
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"]:
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+        elif baseline_path.exists():
+            self.compare(results, json.loads(baseline_path.read_text()), options)
+        else:
+            self.stdout.write(f"No baseline at {baseline_path}; run with --save-baseline")
+
+    # ---------------- MEASUREMENT ---------------- #
+
+    def accounts(self):
+        users = {
+            role: CustomUser.objects.filter(username__startswith="routebench_", role=role).first()
+            for role in ROLES
+        }
+        task = Task.objects.filter(assigned_to=users["user"]).first()
+        return users, {"task_id": task.pk, "pk": users["user"].pk}
+
+    def run_routes(self, options):
+        users, kwargs_pool = self.accounts()
+        accept = ACCEPT[options["format"]]
+        results = {}
+        for pattern in urlpatterns:
+            view_class = getattr(pattern.callback, "view_class", None)
+            if pattern.name in SKIPPED_ROUTES:
+                self.stdout.write(f"skip {pattern.name}: {SKIPPED_ROUTES[pattern.name]}")
+                continue
+            if view_class is None or not hasattr(view_class, "get"):
+                self.stdout.write(f"skip {pattern.name}: no GET handler")
+                continue
+            kwargs = {name: kwargs_pool[name] for name in pattern.pattern.converters}
+            url = reverse(pattern.name, kwargs=kwargs)
+
+            for role in ROLES:
+                client = Client(HTTP_ACCEPT=accept)
+                client.force_login(users[role])
+                results[f"{role} {pattern.name}"] = self.measure(client, url, options["iterations"])
+        return results
+
+    def measure(self, client, url, iterations):
+        client.get(url)  # warm caches and the template loader
+
+        timings = []
+        for _ in range(iterations):
+            started = perf_counter()
+            response = client.get(url)
+            timings.append((perf_counter() - started) * 1000)
+
+        # The query log is a bounded deque; empty it so the capture can grow.
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+
+        tracemalloc.start()
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "status": response.status_code,
+            "p50_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "queries": len(queries),
+            "peak_kb": round(peak / 1024, 1),
+        }
+
+    # ---------------- REPORTING ---------------- #
+
+    def report(self, results):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{'route':<40} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KB':>9}"
+        ))
+        for key, row in results.items():
+            self.stdout.write(
+                f"{key:<40} {row['status']:>6} {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} "
+                f"{row['queries']:>8} {row['peak_kb']:>9.1f}"
+            )
+
+    def compare(self, results, baseline, options):
+        regressions = []
+        for key, row in results.items():
+            base = baseline.get(key)
+            if base is None:
+                continue
+            slower = row["p95_ms"] - base["p95_ms"]
+            if slower > options["min_delta_ms"] and row["p95_ms"] > base["p95_ms"] * (1 + options["tolerance"]):
+                regressions.append(f"{key}: p95 {base['p95_ms']:.3f} -> {row['p95_ms']:.3f} ms")
+            if row["queries"] > base["queries"]:
+                regressions.append(f"{key}: queries {base['queries']} -> {row['queries']}")
+        if regressions:
+            raise CommandError("Routes regressed against baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
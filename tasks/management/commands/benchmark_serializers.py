@@ -0,0 +1,120 @@
+# tasks/management/commands/benchmark_serializers.py
+
+import statistics
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from tasks import renderers
+from tasks.models import CustomUser, Task
+from tasks.seed import seed_dataset
+from tasks.views import TASK_LIST_FIELDS, USER_LIST_FIELDS
+
+PREFIX = "serbench"
+
+
+class TaskModelSerializer(serializers.ModelSerializer):
+    """The DRF equivalent of TASK_LIST_FIELDS, for comparison only."""
+    assigned_to_id = serializers.IntegerField()
+    assigned_to__username = serializers.CharField(source="assigned_to.username")
+    created_by_id = serializers.IntegerField()
+
+    class Meta:
+        model = Task
+        fields = TASK_LIST_FIELDS
+
+
+class UserModelSerializer(serializers.ModelSerializer):
+    """The DRF equivalent of USER_LIST_FIELDS, for comparison only."""
+    assigned_admin_id = serializers.IntegerField(allow_null=True)
+    assigned_admin__username = serializers.CharField(
+        source="assigned_admin.username", default=None
+    )
+
+    class Meta:
+        model = CustomUser
+        fields = USER_LIST_FIELDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Time building and encoding large JSON task and user payloads three "
+        "ways: DRF ModelSerializer + JSONRenderer, values() rows + "
+        "JSONRenderer, and values() rows + the orjson fast path. The seeded "
+        "data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--admins", type=int, default=10)
+        parser.add_argument("--users-per-admin", type=int, default=1000)
+        parser.add_argument("--tasks-per-user", type=int, default=1)
+        parser.add_argument("--iterations", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING(
+                "orjson is not installed; the fast path falls back to JSONRenderer."
+            ))
+        with transaction.atomic():
+            seed_dataset(
+                admins=options["admins"],
+                users_per_admin=options["users_per_admin"],
+                tasks_per_user=options["tasks_per_user"],
+                prefix=PREFIX,
+            )
+            tasks = Task.objects.filter(assigned_to__username__startswith=f"{PREFIX}_")
+            users = CustomUser.objects.filter(username__startswith=f"{PREFIX}_", role="user")
+            task_instances = lambda: TaskModelSerializer(tasks.for_list(), many=True).data
+            task_values = lambda: list(tasks.values(*TASK_LIST_FIELDS))
+            user_instances = lambda: UserModelSerializer(
+                users.select_related("assigned_admin"), many=True
+            ).data
+            user_values = lambda: list(users.values(*USER_LIST_FIELDS))
+            render = JSONRenderer().render
+            cases = (
+                ("tasks", "ModelSerializer", task_instances, render),
+                ("tasks", "values()", task_values, render),
+                ("tasks", "values() + orjson", task_values, renderers.dumps),
+                ("users", "ModelSerializer", user_instances, render),
+                ("users", "values()", user_values, render),
+                ("users", "values() + orjson", user_values, renderers.dumps),
+            )
+            rows = {"tasks": tasks.count(), "users": users.count()}
+            results = [
+                (payload, name, self.measure(build, encode, options["iterations"]))
+                for payload, name, build, encode in cases
+            ]
+            transaction.set_rollback(True)
+        self.report(results, rows)
+
+    def measure(self, build, encode, iterations):
+        build_ms, encode_ms = [], []
+        for _ in range(iterations):
+            started = perf_counter()
+            data = build()
+            built = perf_counter()
+            content = encode(data)
+            build_ms.append((built - started) * 1000)
+            encode_ms.append((perf_counter() - built) * 1000)
+        return {
+            "build_ms": statistics.median(build_ms),
+            "encode_ms": statistics.median(encode_ms),
+            "bytes": len(content),
+        }
+
+    def report(self, results, rows):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'payload':<14} {'serializer':<18} {'build ms':>9} {'encode ms':>10} "
+            f"{'total ms':>9} {'speed-up':>9} {'bytes':>10}"
+        ))
+        baselines = {}
+        for payload, name, row in results:
+            total = row["build_ms"] + row["encode_ms"]
+            baseline = baselines.setdefault(payload, total)
+            self.stdout.write(
+                f"{f'{rows[payload]} {payload}':<14} {name:<18} {row['build_ms']:>9.1f} "
+                f"{row['encode_ms']:>10.1f} {total:>9.1f} {baseline / total:>8.1f}x "
+                f"{row['bytes']:>10}"
+            )
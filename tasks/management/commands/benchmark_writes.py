@@ -0,0 +1,120 @@
+# tasks/management/commands/benchmark_writes.py
+
+import random
+import statistics
+import threading
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from tasks.management.commands.benchmark_routes import percentile
+from tasks.models import CustomUser, Task
+from tasks.seed import seed_dataset
+
+PREFIX = "writebench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure write throughput with parallel clients doing what TaskCreateView "
+        "and TaskUpdateView do. Seeds its own accounts and deletes them afterwards. "
+        "Compare runs with SQLITE_TUNING=0 and SQLITE_TUNING=1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--writes-per-thread", type=int, default=200)
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--tasks-per-user", type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.report_database()
+        if CustomUser.objects.filter(username__startswith=f"{PREFIX}_").exists():
+            self.cleanup()
+        seed_dataset(
+            admins=1,
+            users_per_admin=options["users"],
+            tasks_per_user=options["tasks_per_user"],
+            prefix=PREFIX,
+        )
+        users = list(
+            CustomUser.objects.filter(username__startswith=f"{PREFIX}_user")
+            .values_list("id", "assigned_admin_id")
+        )
+        task_ids = list(
+            Task.objects.filter(assigned_to__username__startswith=f"{PREFIX}_user")
+            .values_list("id", flat=True)
+        )
+
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def client(seed):
+            rng = random.Random(seed)
+            local_latencies, local_errors = [], []
+            try:
+                for _ in range(options["writes_per_thread"]):
+                    started = perf_counter()
+                    try:
+                        self.write(rng, users, task_ids)
+                    except OperationalError as e:
+                        local_errors.append(str(e))
+                        continue
+                    local_latencies.append((perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+                with lock:
+                    latencies.extend(local_latencies)
+                    errors.extend(local_errors)
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(options["threads"])]
+        started = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = perf_counter() - started
+
+        self.cleanup()
+        attempted = options["threads"] * options["writes_per_thread"]
+        self.stdout.write(self.style.MIGRATE_HEADING("\nResults"))
+        self.stdout.write(f"  clients            {options['threads']}")
+        self.stdout.write(f"  writes attempted   {attempted}")
+        self.stdout.write(f"  writes committed   {len(latencies)}")
+        self.stdout.write(f"  lock errors        {len(errors)}")
+        self.stdout.write(f"  throughput         {len(latencies) / elapsed:.1f} writes/s")
+        if latencies:
+            self.stdout.write(f"  p50 latency        {statistics.median(latencies):.2f} ms")
+            self.stdout.write(f"  p95 latency        {percentile(latencies, 0.95):.2f} ms")
+        if errors:
+            self.stdout.write(self.style.WARNING(f"  first error        {errors[0]}"))
+
+    def write(self, rng, users, task_ids):
+        if rng.random() < 0.5:
+            user_id, admin_id = rng.choice(users)
+            Task.objects.create(
+                title="Benchmark task",
+                description="Created by benchmark_writes.",
+                assigned_to_id=user_id,
+                created_by_id=admin_id,
+                due_date="2030-01-01",
+            )
+            return
+        with transaction.atomic():
+            task = Task.objects.get(pk=rng.choice(task_ids))
+            task.worked_hours = rng.randint(1, 8)
+            task.completion_report = "Updated by benchmark_writes."
+            task.status = "completed"
+            task.save()
+
+    def report_database(self):
+        self.stdout.write(f"Database vendor: {connection.vendor}")
+        if connection.vendor != "sqlite":
+            return
+        with connection.cursor() as cursor:
+            for pragma in ("journal_mode", "synchronous", "busy_timeout", "mmap_size"):
+                cursor.execute(f"PRAGMA {pragma}")
+                self.stdout.write(f"  {pragma:<14} {cursor.fetchone()[0]}")
+
+    def cleanup(self):
+        CustomUser.objects.filter(username__startswith=f"{PREFIX}_").delete()
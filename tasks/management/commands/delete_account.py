@@ -0,0 +1,44 @@
+# tasks/management/commands/delete_account.py
+
+from django.core.management.base import BaseCommand, CommandError
+from tasks.bulk import BULK_BATCH_SIZE, delete_account
+from tasks.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete a user or admin and their tasks in batches, printing progress. "
+        "An admin's users are moved to --reassign-to or left unassigned."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--reassign-to", metavar="ADMIN")
+        parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        account = CustomUser.objects.filter(
+            username=options["username"], role__in=("user", "admin")
+        ).first()
+        if account is None:
+            raise CommandError(f"No user or admin named {options['username']}")
+        reassign_to = None
+        if options["reassign_to"]:
+            reassign_to = (
+                CustomUser.objects.filter(username=options["reassign_to"], role="admin")
+                .exclude(pk=account.pk)
+                .first()
+            )
+            if reassign_to is None:
+                raise CommandError(f"No other admin named {options['reassign_to']}")
+
+        result = delete_account(
+            account, reassign_to, batch_size=options["batch_size"], progress=self.progress
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {account.username}: {result['tasks_deleted']} tasks, "
+            f"{result['users_released']} users released"
+        ))
+
+    def progress(self, done, total):
+        self.stdout.write(f"  {done}/{total} tasks deleted")
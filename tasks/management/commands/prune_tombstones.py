@@ -0,0 +1,19 @@
+# tasks/management/commands/prune_tombstones.py
+
+from django.core.management.base import BaseCommand
+from tasks.sync import TOMBSTONE_RETENTION_DAYS, prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete tombstones of deleted tasks and scope entries of reassigned users' "
+        "tasks older than the retention period. "
+        "Delta sync cursors older than that get 410 Gone and must resync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=TOMBSTONE_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones(days=options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones and scope entries"))
@@ -0,0 +1,15 @@
+# tasks/management/commands/rebuild_rollups.py
+
+from django.core.management.base import BaseCommand
+from tasks.rollups import ROLLUP_BATCH_SIZE, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily task rollups from the live and archived task tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=ROLLUP_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        buckets = rebuild_rollups(batch_size=options["batch_size"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} rollup buckets"))
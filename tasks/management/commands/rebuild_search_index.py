@@ -0,0 +1,24 @@
+# tasks/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+from django.db import connections, router
+from tasks.models import Task
+from tasks.search import SEARCH_BATCH_SIZE, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Index existing tasks for full-text search in batches. Only needed on "
+        "SQLite, after rows were written without the save signals (raw SQL, "
+        "QuerySet.update()); PostgreSQL maintains its index itself."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=SEARCH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if connections[router.db_for_write(Task)].vendor != "sqlite":
+            self.stdout.write("The search index is an expression index maintained by the database.")
+            return
+        indexed = rebuild_search_index(batch_size=options["batch_size"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} tasks"))
@@ -0,0 +1,66 @@
+# tasks/management/commands/run_jobs.py
+
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from tasks.jobs import claim_job, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs (cascading deletes, rollup and search rebuilds, "
+        "exports) with a pool of worker threads until interrupted. Jobs that "
+        "raise are retried with exponential backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0,
+            help="Seconds an idle worker waits before looking for jobs again.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once no job is due instead of polling."
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: stop.set())
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        workers = [
+            threading.Thread(
+                target=self.work, args=(f"{prefix}:{n}", stop, options), daemon=True
+            )
+            for n in range(options["workers"])
+        ]
+        for worker in workers:
+            worker.start()
+        # Join with a timeout so the main thread keeps handling signals.
+        while any(worker.is_alive() for worker in workers):
+            for worker in workers:
+                worker.join(timeout=0.5)
+        self.stdout.write("Workers stopped")
+
+    def work(self, worker_id, stop, options):
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                requeue_stale_jobs()
+                job = claim_job(worker_id)
+                if job is None:
+                    if options["once"]:
+                        return
+                    stop.wait(options["poll_interval"])
+                    continue
+                job = run_job(job)
+                style = self.style.SUCCESS if job.status == "succeeded" else self.style.WARNING
+                self.stdout.write(style(f"[{worker_id}] {job.kind} #{job.pk}: {job.status}"))
+        finally:
+            connections.close_all()
@@ -0,0 +1,44 @@
+# tasks/management/commands/seed_data.py
+
+from django.core.management.base import BaseCommand, CommandError
+from tasks.models import CustomUser
+from tasks.rollups import rebuild_rollups
+from tasks.seed import seed_dataset
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic superadmin/admin/user/task data with bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--admins", type=int, default=10)
+        parser.add_argument("--users-per-admin", type=int, default=20)
+        parser.add_argument("--tasks-per-user", type=int, default=50)
+        parser.add_argument("--prefix", default="seed", help="Username prefix for seeded accounts.")
+        parser.add_argument("--password", default="password")
+        parser.add_argument("--days", type=int, default=365, help="Spread task dates over this many days.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--skip-rollups", action="store_true", help="Do not rebuild the daily rollups afterwards."
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if CustomUser.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Users prefixed '{prefix}_' already exist; pick another --prefix")
+
+        counts = seed_dataset(
+            admins=options["admins"],
+            users_per_admin=options["users_per_admin"],
+            tasks_per_user=options["tasks_per_user"],
+            prefix=prefix,
+            batch_size=options["batch_size"],
+            days=options["days"],
+            password=options["password"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded 1 superadmin, {counts['admins']} admins, {counts['users']} users "
+            f"and {counts['tasks']} tasks (password '{options['password']}')"
+        ))
+        if not options["skip_rollups"]:
+            buckets = rebuild_rollups(batch_size=options["batch_size"])
+            self.stdout.write(f"Rebuilt {buckets} rollup buckets")
@@ -0,0 +1,148 @@
+# tasks/middleware.py
+
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("tasks.performance")
+
+DUPLICATE_QUERY_THRESHOLD = getattr(settings, "TASKS_DUPLICATE_QUERY_THRESHOLD", 5)
+
+
+# ---------------- METRICS REGISTRY ---------------- #
+
+class ViewMetrics:
+    """Process-wide request totals per view, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = defaultdict(lambda: [0, 0.0, 0, 0.0])
+
+    def record(self, view, seconds, queries, db_seconds):
+        with self._lock:
+            totals = self._totals[view]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += queries
+            totals[3] += db_seconds
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+    def render(self):
+        with self._lock:
+            snapshot = {view: list(totals) for view, totals in self._totals.items()}
+        series = (
+            ("tasks_view_requests_total", "counter", "Requests handled per view.", 0),
+            ("tasks_view_seconds_total", "counter", "Wall time spent per view.", 1),
+            ("tasks_view_db_queries_total", "counter", "Database queries issued per view.", 2),
+            ("tasks_view_db_seconds_total", "counter", "Database time spent per view.", 3),
+        )
+        lines = []
+        for name, kind, help_text, index in series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for view, totals in sorted(snapshot.items()):
+                lines.append(f'{name}{{view="{view}"}} {totals[index]}')
+        return "\n".join(lines) + "\n"
+
+
+view_metrics = ViewMetrics()
+
+
+# ---------------- MIDDLEWARE ---------------- #
+
+class QueryRecorder:
+    """``execute_wrapper`` callable counting and timing every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+
+class QueryTimingMiddleware:
+    """
+    Time each request and its database work.
+
+    Adds a ``Server-Timing`` header, feeds ``view_metrics`` and logs SQL
+    statements repeated often enough within one request to suggest an N+1.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        # Connections belong to the thread the ORM runs sync code in, so the
+        # wrapper has to be installed from there rather than the event loop.
+        recorder = QueryRecorder()
+        started = perf_counter()
+        await sync_to_async(self.install)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(self.uninstall)(recorder)
+        return self.finish(request, response, recorder, started)
+
+    def install(self, recorder):
+        for connection in connections.all():
+            connection.execute_wrappers.append(recorder)
+
+    def uninstall(self, recorder):
+        for connection in connections.all():
+            if recorder in connection.execute_wrappers:
+                connection.execute_wrappers.remove(recorder)
+
+    def finish(self, request, response, recorder, started):
+        elapsed = perf_counter() - started
+        view = getattr(request, "_timing_view_name", "unresolved")
+        view_metrics.record(view, elapsed, recorder.count, recorder.seconds)
+        response["Server-Timing"] = (
+            f"app;dur={elapsed * 1000:.1f}, "
+            f'db;dur={recorder.seconds * 1000:.1f};desc="{recorder.count} queries"'
+        )
+        self.log_duplicates(view, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        request._timing_view_name = (view_class or view_func).__name__
+
+    def log_duplicates(self, view, recorder):
+        for sql, count in recorder.statements.most_common():
+            if count < DUPLICATE_QUERY_THRESHOLD:
+                break
+            logger.warning("Possible N+1 in %s: %d executions of %s", view, count, sql)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_role_scope_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'completed')), fields=['updated_at', 'id'], name='task_completed_updated_idx'),
+        ),
+    ]
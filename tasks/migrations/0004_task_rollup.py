@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_completed_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('assigned_tasks', models.IntegerField(default=0)),
+                ('completed_tasks', models.IntegerField(default=0)),
+                ('worked_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('admin', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('assignee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['admin', 'day'], name='rollup_admin_day_idx'), models.Index(fields=['day'], name='rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('assignee', 'day'), name='rollup_assignee_day_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'updated_at'], name='task_assignee_updated_idx'),
+        ),
+    ]
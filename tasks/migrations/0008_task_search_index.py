@@ -0,0 +1,49 @@
+from django.db import migrations
+
+# The search index lives outside the model state: an FTS5 table on SQLite,
+# a GIN expression index on PostgreSQL. The PostgreSQL expression must stay
+# identical to tasks.search.PG_VECTOR for queries to use it.
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5("
+    "title, description, completion_report, tokenize='porter unicode61')"
+)
+SQLITE_FILL = (
+    "INSERT INTO tasks_task_fts (rowid, title, description, completion_report) "
+    "SELECT id, title, description, coalesce(completion_report, '') FROM tasks_task"
+)
+SQLITE_DROP = "DROP TABLE IF EXISTS tasks_task_fts"
+POSTGRESQL_CREATE = (
+    "CREATE INDEX IF NOT EXISTS task_search_idx ON tasks_task USING GIN (("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(completion_report, '')), 'C')))"
+)
+POSTGRESQL_DROP = "DROP INDEX IF EXISTS task_search_idx"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(SQLITE_FILL)
+    elif vendor == "postgresql":
+        schema_editor.execute(POSTGRESQL_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_DROP)
+    elif vendor == "postgresql":
+        schema_editor.execute(POSTGRESQL_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_tombstone'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
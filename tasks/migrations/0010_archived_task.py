@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('due_date', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed')], default='completed', max_length=20)),
+                ('completion_report', models.TextField(blank=True, null=True)),
+                ('worked_hours', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assigned_to', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='archived_created_idx'), models.Index(fields=['assigned_to', '-created_at', '-id'], name='archived_assignee_created_idx'), models.Index(fields=['updated_at', 'id'], name='archived_updated_idx'), models.Index(fields=['assigned_to', 'updated_at', 'id'], name='archived_assignee_updated_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_archived_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskScopeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('admin_id', models.BigIntegerField()),
+                ('entered_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['entered_at', 'id'],
+                'indexes': [models.Index(fields=['admin_id', 'entered_at', 'id'], name='scope_entry_admin_idx'), models.Index(fields=['entered_at', 'id'], name='scope_entry_entered_idx')],
+            },
+        ),
+    ]
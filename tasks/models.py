@@ -1,7 +1,29 @@
 # tasks/models.py
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.db import models
+from django.utils import timezone
+
+SCOPE_CACHE_TIMEOUT = getattr(settings, "TASKS_SCOPE_CACHE_TIMEOUT", 300)
+
+
+def managed_users_cache_key(admin_id):
+    return f"tasks:scope:admin:{admin_id}"
+
+
+def managed_user_ids(admin_id):
+    """Ids of the users assigned to an admin, cached until reassignment."""
+    key = managed_users_cache_key(admin_id)
+    user_ids = cache.get(key)
+    if user_ids is None:
+        user_ids = frozenset(
+            CustomUser.objects.filter(assigned_admin_id=admin_id, role='user')
+            .values_list('id', flat=True)
+        )
+        cache.set(key, user_ids, SCOPE_CACHE_TIMEOUT)
+    return user_ids
 
 class CustomUser(AbstractUser):
     ROLE_CHOICES = (
@@ -18,13 +40,39 @@ class CustomUser(AbstractUser):
         related_name='assigned_users',
         limit_choices_to={'role': 'admin'}
     )
+    # Bumped whenever claims embedded in issued JWTs go stale.
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
 
+    def managed_user_ids(self):
+        return managed_user_ids(self.pk)
+
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['role', '-date_joined', '-id'], name='user_role_joined_idx'),
+            models.Index(fields=['assigned_admin', 'role'], name='user_admin_role_idx'),
+        ]
+
+
+class TaskQuerySet(models.QuerySet):
+    LIST_DEFERRED_FIELDS = ("description", "completion_report")
+
+    def for_user(self, user):
+        if user.role == "superadmin":
+            return self.all()
+        if user.role == "admin":
+            return self.filter(assigned_to_id__in=user.managed_user_ids())
+        return self.filter(assigned_to_id=user.pk)
+
+    def with_people(self):
+        return self.select_related("assigned_to", "created_by")
+
+    def for_list(self):
+        return self.with_people().defer(*self.LIST_DEFERRED_FIELDS)
 
 
 class Task(models.Model):
@@ -60,8 +108,193 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} - {self.assigned_to.username}"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='task_created_idx'),
+            models.Index(fields=['assigned_to', 'status'], name='task_assignee_status_idx'),
+            models.Index(
+                fields=['assigned_to', '-created_at', '-id'], name='task_assignee_created_idx'
+            ),
+            # Covers the MAX(updated_at)/COUNT behind the list ETags.
+            models.Index(fields=['assigned_to', 'updated_at'], name='task_assignee_updated_idx'),
+            models.Index(fields=['updated_at', 'id'], name='task_updated_idx'),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='task_completed_created_idx',
+                condition=models.Q(status='completed'),
+            ),
+            models.Index(
+                fields=['updated_at', 'id'],
+                name='task_completed_updated_idx',
+                condition=models.Q(status='completed'),
+            ),
+        ]
+
+# Completed tasks moved out of tasks_task once they are older than
+# TASKS_ARCHIVE_AFTER_DAYS (see tasks/archive.py), keeping their original ids.
+class ArchivedTask(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    assigned_to = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='archived_tasks'
+    )
+    created_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    due_date = models.DateField()
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, default='completed')
+    completion_report = models.TextField(blank=True, null=True)
+    worked_hours = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        blank=True,
+        null=True
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    objects = TaskQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.title} - {self.assigned_to.username} (archived)"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='archived_created_idx'),
+            models.Index(
+                fields=['assigned_to', '-created_at', '-id'], name='archived_assignee_created_idx'
+            ),
+            models.Index(fields=['updated_at', 'id'], name='archived_updated_idx'),
+            models.Index(
+                fields=['assigned_to', 'updated_at', 'id'], name='archived_assignee_updated_idx'
+            ),
+        ]
+
+
+# Daily per-assignee totals, maintained as tasks are created and completed.
+class TaskRollup(models.Model):
+    day = models.DateField()
+    assignee = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='task_rollups'
+    )
+    admin = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    assigned_tasks = models.IntegerField(default=0)
+    completed_tasks = models.IntegerField(default=0)
+    worked_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.assignee_id} @ {self.day}"
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['assignee', 'day'], name='rollup_assignee_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['admin', 'day'], name='rollup_admin_day_idx'),
+            models.Index(fields=['day'], name='rollup_day_idx'),
+        ]
+
+
+# Left behind when a task is deleted or moved to another assignee, so delta
+# sync clients learn to drop it. Plain ids: the users may be gone as well.
+class TaskTombstone(models.Model):
+    task_id = models.BigIntegerField()
+    assignee_id = models.BigIntegerField(null=True, blank=True)
+    admin_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"task {self.task_id} @ {self.deleted_at}"
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_idx'),
+            models.Index(fields=['assignee_id', 'deleted_at', 'id'], name='tombstone_assignee_idx'),
+            models.Index(fields=['admin_id', 'deleted_at', 'id'], name='tombstone_admin_idx'),
+        ]
+
+
+# Left behind when a user is moved to another admin, one per task, so that
+# admin's delta sync clients download tasks that entered their scope without
+# being edited. Plain ids, as for tombstones.
+class TaskScopeEntry(models.Model):
+    task_id = models.BigIntegerField()
+    admin_id = models.BigIntegerField()
+    entered_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"task {self.task_id} -> admin {self.admin_id} @ {self.entered_at}"
+
+    class Meta:
+        ordering = ['entered_at', 'id']
+        indexes = [
+            models.Index(fields=['admin_id', 'entered_at', 'id'], name='scope_entry_admin_idx'),
+            models.Index(fields=['entered_at', 'id'], name='scope_entry_entered_idx'),
+        ]
+
+
+# Background work (cascading deletes, rebuilds, exports) claimed and run by
+# the run_jobs worker command.
+class Job(models.Model):
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    )
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['status', 'run_after', 'id'], name='job_queue_idx'),
+            models.Index(fields=['created_by', '-created_at', '-id'], name='job_owner_idx'),
+        ]
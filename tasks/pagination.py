@@ -0,0 +1,196 @@
+# tasks/pagination.py
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .renderers import dumps
+
+
+def _query_params(request):
+    # DRF requests expose query_params; the async views get plain HttpRequests.
+    return getattr(request, "query_params", request.GET)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a descending ``(timestamp, id)`` pair.
+
+    Each cursor carries the position of the last (or first) row on the
+    current page, so fetching any page is a single indexed range scan no
+    matter how deep the client has paged.
+    """
+    cursor_query_param = "cursor"
+    page_size = getattr(settings, "TASKS_PAGE_SIZE", 50)
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "TASKS_MAX_PAGE_SIZE", 500)
+    invalid_cursor_message = "Invalid cursor"
+    key_field = "created_at"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return await self.apaginate_querysets([queryset], request)
+
+    def paginate_querysets(self, querysets, request):
+        """
+        Paginate several querysets, e.g. live and archived tasks, as if they
+        were one. Their ids must not overlap.
+        """
+        pages = [list(self.page_queryset(queryset, request)) for queryset in querysets]
+        return self.set_page(self.merge_pages(pages))
+
+    async def apaginate_querysets(self, querysets, request):
+        pages = []
+        for queryset in querysets:
+            pages.append([row async for row in self.page_queryset(queryset, request)])
+        return self.set_page(self.merge_pages(pages))
+
+    def merge_pages(self, pages):
+        if len(pages) == 1:
+            return pages[0]
+        # Every page is already in cursor order and one row longer than the
+        # page, so the sorted merge starts with what a single query returns.
+        rows = [row for page in pages for row in page]
+        rows.sort(key=self._position, reverse=not self.reverse)
+        return rows
+
+    def page_queryset(self, queryset, request):
+        """Order, filter and slice ``queryset`` to one page plus a look-ahead row."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        key = self.key_field
+        if self.reverse:
+            queryset = queryset.order_by(key, "id")
+        else:
+            queryset = queryset.order_by(f"-{key}", "-id")
+        if self.position is not None:
+            value, pk = self.position
+            if self.reverse:
+                after = Q(**{f"{key}__gt": value}) | Q(**{key: value, "id__gt": pk})
+            else:
+                after = Q(**{f"{key}__lt": value}) | Q(**{key: value, "id__lt": pk})
+            queryset = queryset.filter(after)
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(_query_params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ---------------- CURSORS ---------------- #
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            return row[self.key_field], row["id"]
+        return getattr(row, self.key_field), row.pk
+
+    def encode_cursor(self, row, reverse):
+        value, pk = self._position(row)
+        payload = json.dumps({"p": [value.isoformat(), pk], "r": reverse})
+        cursor = urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = _query_params(request).get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode()))
+            value, pk = payload["p"]
+            value = parse_datetime(value)
+            if value is None:
+                raise ValueError(encoded)
+            return (value, int(pk)), bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+
+class TaskPagination(KeysetPagination):
+    key_field = "created_at"
+
+
+class UserPagination(KeysetPagination):
+    key_field = "date_joined"
+
+
+def paginated_response(request, view, queryset, key, serializer, pagination_class=TaskPagination,
+                       archived=None):
+    """
+    Paginate ``queryset``, plus ``archived`` when given, for either renderer.
+
+    HTML requests get model instances for the template; JSON requests read
+    only the ``serializer``'s fields via ``values()`` so no model instances
+    are built. The cursor columns are always read, whatever ``?fields=``
+    asks for.
+    """
+    querysets = [queryset] if archived is None else [queryset, archived]
+    if request.accepted_renderer.format == "json":
+        querysets = [
+            serializer.values(qs, request, required=("id", pagination_class.key_field))
+            for qs in querysets
+        ]
+    paginator = pagination_class()
+    page = paginator.paginate_querysets(querysets, request)
+    return Response({
+        key: page,
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+    })
+
+
+async def apaginated_response(request, queryset, key, pagination_class=TaskPagination,
+                              archived=None):
+    """``paginated_response`` for the async JSON views; the querysets must be ``values()``."""
+    paginator = pagination_class()
+    querysets = [queryset] if archived is None else [queryset, archived]
+    page = await paginator.apaginate_querysets(querysets, request)
+    return HttpResponse(dumps({
+        key: page,
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+    }), content_type="application/json")
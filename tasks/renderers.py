@@ -0,0 +1,38 @@
+# tasks/renderers.py
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def dumps(data):
+    """
+    Encode ``data`` exactly as DRF's ``JSONRenderer`` would, using orjson
+    when it is installed. Types orjson does not know (``Decimal``, lazy
+    strings, querysets) go through DRF's encoder.
+    """
+    if orjson is None:
+        return JSONRenderer().render(data)
+    content = orjson.dumps(
+        data, default=_encoder.default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    )
+    # JSONRenderer escapes these two so the output is also valid JavaScript.
+    return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` with the orjson fast path of ``dumps``."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            # orjson only indents by two spaces; honour "indent=N" the slow way.
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
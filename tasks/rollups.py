@@ -0,0 +1,194 @@
+# tasks/rollups.py
+
+from collections import defaultdict
+from decimal import Decimal
+from itertools import chain
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from .models import ArchivedTask, CustomUser, Task, TaskRollup
+
+ROLLUP_BATCH_SIZE = getattr(settings, "TASKS_ROLLUP_BATCH_SIZE", 2000)
+ZERO = Decimal("0")
+
+
+# ---------------- CONTRIBUTIONS ---------------- #
+
+def snapshot(task):
+    """The task fields that decide which rollup buckets it counts towards."""
+    return (
+        task.assigned_to_id,
+        task.status,
+        task.worked_hours,
+        task.created_at,
+        task.updated_at,
+    )
+
+
+def _contribution(state):
+    """Map ``(assignee_id, day)`` to ``[assigned, completed, hours]`` for one task."""
+    assignee_id, status, worked_hours, created_at, updated_at = state
+    buckets = defaultdict(lambda: [0, 0, ZERO])
+    if assignee_id is None or created_at is None:
+        return buckets
+    buckets[(assignee_id, timezone.localdate(created_at))][0] += 1
+    if status == "completed":
+        bucket = buckets[(assignee_id, timezone.localdate(updated_at))]
+        bucket[1] += 1
+        bucket[2] += Decimal(str(worked_hours or 0))
+    return buckets
+
+
+def deltas_between(old_state, new_state):
+    """Net change to every bucket when a task moves from one state to another."""
+    deltas = defaultdict(lambda: [0, 0, ZERO])
+    for sign, state in ((-1, old_state), (1, new_state)):
+        if state is None:
+            continue
+        for key, (assigned, completed, hours) in _contribution(state).items():
+            delta = deltas[key]
+            delta[0] += sign * assigned
+            delta[1] += sign * completed
+            delta[2] += sign * hours
+    return {key: delta for key, delta in deltas.items() if any(delta)}
+
+
+def merge_deltas(changes):
+    merged = defaultdict(lambda: [0, 0, ZERO])
+    for deltas in changes:
+        for key, (assigned, completed, hours) in deltas.items():
+            total = merged[key]
+            total[0] += assigned
+            total[1] += completed
+            total[2] += hours
+    return {key: total for key, total in merged.items() if any(total)}
+
+
+# ---------------- WRITES ---------------- #
+
+def apply_deltas(deltas, create=True):
+    """
+    Add ``deltas`` to the stored buckets with one UPDATE each, creating
+    missing buckets unless ``create`` is false (used while deleting).
+    """
+    if not deltas:
+        return
+    admin_ids = dict(
+        CustomUser.objects.filter(pk__in={key[0] for key in deltas})
+        .values_list("id", "assigned_admin_id")
+    )
+    for (assignee_id, day), (assigned, completed, hours) in deltas.items():
+        if assignee_id not in admin_ids:
+            continue
+        changes = {
+            "assigned_tasks": F("assigned_tasks") + assigned,
+            "completed_tasks": F("completed_tasks") + completed,
+            "worked_hours": F("worked_hours") + hours,
+            "admin_id": admin_ids[assignee_id],
+        }
+        rollups = TaskRollup.objects.filter(assignee_id=assignee_id, day=day)
+        if rollups.update(**changes) or not create:
+            continue
+        try:
+            with transaction.atomic():
+                TaskRollup.objects.create(
+                    assignee_id=assignee_id,
+                    admin_id=admin_ids[assignee_id],
+                    day=day,
+                    assigned_tasks=assigned,
+                    completed_tasks=completed,
+                    worked_hours=hours,
+                )
+        except IntegrityError:
+            # Another request created the bucket first; add to it instead.
+            rollups.update(**changes)
+
+
+def record_tasks(tasks, previous=None):
+    """
+    Fold saved ``tasks`` into the rollups. ``previous`` maps task id to the
+    snapshot taken before the change; tasks missing from it count as new.
+    """
+    previous = previous or {}
+    apply_deltas(merge_deltas(
+        deltas_between(previous.get(task.pk), snapshot(task)) for task in tasks
+    ))
+
+
+# ---------------- REBUILD ---------------- #
+
+def rebuild_rollups(batch_size=ROLLUP_BATCH_SIZE, stdout=None):
+    """
+    Recompute every bucket from the live and archived task tables,
+    streaming them in batches.
+    """
+    totals = defaultdict(lambda: [0, 0, ZERO])
+    rows = chain.from_iterable(
+        model.objects.order_by().values_list(
+            "assigned_to_id", "status", "worked_hours", "created_at", "updated_at"
+        ).iterator(chunk_size=batch_size)
+        for model in (Task, ArchivedTask)
+    )
+    for count, state in enumerate(rows, start=1):
+        for key, (assigned, completed, hours) in _contribution(state).items():
+            total = totals[key]
+            total[0] += assigned
+            total[1] += completed
+            total[2] += hours
+        if stdout is not None and count % batch_size == 0:
+            stdout.write(f"  scanned {count} tasks")
+
+    admin_ids = dict(CustomUser.objects.values_list("id", "assigned_admin_id"))
+    with transaction.atomic():
+        TaskRollup.objects.all().delete()
+        TaskRollup.objects.bulk_create(
+            (
+                TaskRollup(
+                    assignee_id=assignee_id,
+                    admin_id=admin_ids.get(assignee_id),
+                    day=day,
+                    assigned_tasks=assigned,
+                    completed_tasks=completed,
+                    worked_hours=hours,
+                )
+                for (assignee_id, day), (assigned, completed, hours) in totals.items()
+            ),
+            batch_size=batch_size,
+        )
+    return len(totals)
+
+
+# ---------------- REPORTS ---------------- #
+
+ROLLUP_GROUPS = {"user": "assignee_id", "admin": "admin_id", "day": "day"}
+
+
+def rollups_for(user):
+    if user.role == "superadmin":
+        return TaskRollup.objects.all()
+    if user.role == "admin":
+        return TaskRollup.objects.filter(admin_id=user.pk)
+    return TaskRollup.objects.filter(assignee_id=user.pk)
+
+
+def rollup_report(rollups, group):
+    field = ROLLUP_GROUPS[group]
+    rows = (
+        rollups.order_by(field)
+        .values(field)
+        .annotate(
+            assigned_tasks=Sum("assigned_tasks"),
+            completed_tasks=Sum("completed_tasks"),
+            worked_hours=Sum("worked_hours"),
+        )
+    )
+    report = []
+    for row in rows:
+        assigned = row["assigned_tasks"]
+        row["completion_rate"] = (
+            round(row["completed_tasks"] / assigned, 4) if assigned > 0 else None
+        )
+        report.append(row)
+    return report
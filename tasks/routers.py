@@ -0,0 +1,98 @@
+# tasks/routers.py
+
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = "replica"
+PIN_COOKIE = "tasks_pin_primary"
+PIN_SECONDS = getattr(settings, "TASKS_REPLICA_PIN_SECONDS", 10)
+REPLICA_VIEW_MODULES = ("tasks.views", "tasks.async_views")
+
+# Alias reads should use for the request being handled, if any.
+read_alias = ContextVar("tasks_read_alias", default=None)
+
+
+class ReplicaRouter:
+    """Send reads to the alias chosen for the current request; writes go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        alias = read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route read-only ``tasks.views`` and ``tasks.async_views`` handlers to the replica.
+
+    A successful write sets a short-lived cookie so the redirect that
+    follows it (and anything else the client loads right after) reads its
+    own writes from the primary. Views whose GET handler writes declare
+    ``writes_on_get = True``; they stay on the primary and pin it like any
+    other write.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_alias.set(None)
+        return self.pin_primary(request, response)
+
+    async def __acall__(self, request):
+        read_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_alias.set(None)
+        return self.pin_primary(request, response)
+
+    def pin_primary(self, request, response):
+        writes = request.method not in SAFE_METHODS or getattr(request, "writes_on_get", False)
+        if writes and response.status_code < 400:
+            response.set_cookie(PIN_COOKIE, "1", max_age=PIN_SECONDS, httponly=True, samesite="Lax")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(getattr(view_func, "view_class", None), "writes_on_get", False):
+            request.writes_on_get = True
+            return None
+        if request.method not in SAFE_METHODS or request.COOKIES.get(PIN_COOKIE):
+            return None
+        if view_func.__module__ in REPLICA_VIEW_MODULES:
+            # Bearer tokens are only checked later, inside the view, and their
+            # version lookup always reads the primary.
+            if not request.headers.get("Authorization"):
+                # Resolve the session user on the primary before switching, so
+                # a fresh login never depends on replication lag.
+                user = getattr(request, "user", None)
+                if user is not None and not user.is_authenticated:
+                    return None
+            read_alias.set(REPLICA_DB_ALIAS)
+        return None
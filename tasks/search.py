@@ -0,0 +1,169 @@
+# tasks/search.py
+
+import re
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from .models import Task
+
+SEARCH_BATCH_SIZE = getattr(settings, "TASKS_SEARCH_BATCH_SIZE", 2000)
+SEARCH_MAX_RESULTS = getattr(settings, "TASKS_SEARCH_MAX_RESULTS", 100)
+SEARCH_MAX_TERMS = 8
+SEARCH_FIELDS = ("title", "description", "completion_report")
+FTS_TABLE = "tasks_task_fts"
+# Must match the expression indexed by migration 0008, or PostgreSQL will
+# not use the GIN index. Title outranks description, which outranks reports.
+PG_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(completion_report, '')), 'C')"
+)
+# bm25() column weights for title, description and completion_report.
+SQLITE_RANK = f"bm25({FTS_TABLE}, 10.0, 2.0, 1.0)"
+
+
+def _write_connection():
+    return connections[router.db_for_write(Task)]
+
+
+# ---------------- INDEXING (SQLite) ---------------- #
+# PostgreSQL indexes an expression over the task columns, so it needs no upkeep.
+
+def index_task_ids(task_ids):
+    """(Re)index the given tasks from their current rows."""
+    connection = _write_connection()
+    task_ids = [pk for pk in task_ids if pk]
+    if connection.vendor != "sqlite" or not task_ids:
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(task_ids), SEARCH_BATCH_SIZE):
+            batch = task_ids[start:start + SEARCH_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, completion_report) "
+                f"SELECT id, title, description, coalesce(completion_report, '') "
+                f"FROM tasks_task WHERE id IN ({placeholders})",
+                batch,
+            )
+
+
+def unindex_task_ids(task_ids):
+    connection = _write_connection()
+    task_ids = [pk for pk in task_ids if pk]
+    if connection.vendor != "sqlite" or not task_ids:
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(task_ids), SEARCH_BATCH_SIZE):
+            batch = task_ids[start:start + SEARCH_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch)
+
+
+def rebuild_search_index(batch_size=SEARCH_BATCH_SIZE, stdout=None):
+    """
+    Index every existing task in id order, one batch per transaction, then
+    drop entries left behind by tasks deleted while nothing kept the index.
+    Returns the number of tasks indexed.
+    """
+    if _write_connection().vendor != "sqlite":
+        return 0
+    indexed, last_id = 0, 0
+    while True:
+        batch = list(
+            Task.objects.filter(pk__gt=last_id).order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not batch:
+            break
+        with transaction.atomic(using=router.db_for_write(Task)):
+            index_task_ids(batch)
+        indexed += len(batch)
+        last_id = batch[-1]
+        if stdout is not None:
+            stdout.write(f"  indexed {indexed} tasks")
+    with _write_connection().cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid NOT IN (SELECT id FROM tasks_task)"
+        )
+    return indexed
+
+
+# ---------------- QUERIES ---------------- #
+
+def search_terms(query):
+    """Words in ``query``; punctuation is dropped so input can never be query syntax."""
+    return re.findall(r"\w+", (query or "").lower())[:SEARCH_MAX_TERMS]
+
+
+def _match_expression(vendor, terms):
+    # Every word must match; the last one is a prefix, for search-as-you-type.
+    if vendor == "postgresql":
+        return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    return " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+
+def matching_tasks_sql(terms, using):
+    """``SELECT`` of the ids of tasks matching every term, for ``id IN (...)`` filters."""
+    vendor = connections[using].vendor
+    match = _match_expression(vendor, terms)
+    if vendor == "postgresql":
+        return (
+            f"SELECT id FROM tasks_task WHERE {PG_VECTOR} @@ to_tsquery('english', %s)",
+            [match],
+        )
+    return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+
+
+def ranked_task_ids(user, query, limit=SEARCH_MAX_RESULTS):
+    """
+    ``[(task_id, score), ...]`` for the best matches in ``user``'s scope,
+    best first. Scoping happens inside the ranked query, so tasks the
+    user cannot see never push visible ones out of the limit.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    using = router.db_for_read(Task)
+    connection = connections[using]
+    match = _match_expression(connection.vendor, terms)
+
+    id_column = "id" if connection.vendor == "postgresql" else "rowid"
+    scope_sql, scope_params = "", []
+    if user.role != "superadmin":
+        scope = Task.objects.using(using).for_user(user).order_by().values("id")
+        sql, scope_params = scope.query.sql_with_params()
+        scope_sql = f" AND {id_column} IN ({sql})"
+
+    if connection.vendor == "postgresql":
+        sql = (
+            f"SELECT id, ts_rank({PG_VECTOR}, q) AS score "
+            f"FROM tasks_task, to_tsquery('english', %s) AS q "
+            f"WHERE {PG_VECTOR} @@ q{scope_sql} "
+            f"ORDER BY score DESC, id DESC LIMIT %s"
+        )
+    else:
+        sql = (
+            f"SELECT rowid, -{SQLITE_RANK} AS score FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s{scope_sql} "
+            f"ORDER BY score DESC, rowid DESC LIMIT %s"
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, *scope_params, limit])
+        return [(task_id, float(score)) for task_id, score in cursor.fetchall()]
+
+
+def search_tasks(user, query, fields, limit=SEARCH_MAX_RESULTS):
+    """The best ``limit`` matches as ``values(*fields)`` rows with a ``score``."""
+    ranked = ranked_task_ids(user, query, limit)
+    if not ranked:
+        return []
+    rows = {
+        row["id"]: row
+        for row in Task.objects.filter(pk__in=[pk for pk, _ in ranked]).values(*fields)
+    }
+    return [
+        {**rows[pk], "score": round(score, 4)}
+        for pk, score in ranked
+        if pk in rows
+    ]
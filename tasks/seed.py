@@ -0,0 +1,95 @@
+# tasks/seed.py
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from .models import CustomUser, Task
+from .search import index_task_ids
+from .summary import invalidate_summaries
+
+STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+
+def seed_dataset(admins=10, users_per_admin=20, tasks_per_user=50, prefix="seed",
+                 batch_size=1000, days=365, password="password"):
+    """
+    Insert a synthetic superadmin/admin/user/task hierarchy with bulk_create.
+
+    Task timestamps are spread over the last ``days`` days so ordering and
+    date-range queries behave like a long-lived deployment. Daily rollups
+    are not maintained here; run ``rebuild_rollups`` afterwards if needed.
+    Returns the number of rows created per model.
+    """
+    rng = random.Random(prefix)
+    now = timezone.now()
+    hashed = make_password(password)
+
+    CustomUser.objects.bulk_create(
+        [CustomUser(username=f"{prefix}_superadmin", password=hashed, role="superadmin")]
+        + [
+            CustomUser(username=f"{prefix}_admin{a}", password=hashed, role="admin")
+            for a in range(admins)
+        ],
+        batch_size=batch_size,
+    )
+    admin_ids = list(
+        CustomUser.objects.filter(username__startswith=f"{prefix}_admin", role="admin")
+        .values_list("id", flat=True)
+    )
+
+    CustomUser.objects.bulk_create(
+        [
+            CustomUser(
+                username=f"{prefix}_user{a}_{u}",
+                password=hashed,
+                role="user",
+                assigned_admin_id=admin_id,
+            )
+            for a, admin_id in enumerate(admin_ids)
+            for u in range(users_per_admin)
+        ],
+        batch_size=batch_size,
+    )
+    users = list(
+        CustomUser.objects.filter(username__startswith=f"{prefix}_user", role="user")
+        .values_list("id", "assigned_admin_id")
+    )
+
+    task_count = 0
+    pending = []
+    for user_id, admin_id in users:
+        for t in range(tasks_per_user):
+            status = rng.choice(STATUSES)
+            completed = status == "completed"
+            pending.append(Task(
+                title=f"{prefix} task {user_id}-{t}",
+                description="Synthetic task generated for benchmarking.",
+                assigned_to_id=user_id,
+                created_by_id=admin_id,
+                due_date=(now + timedelta(days=rng.randint(-days, 30))).date(),
+                status=status,
+                completion_report="Done." if completed else None,
+                worked_hours=rng.randint(1, 16) if completed else None,
+            ))
+            if len(pending) >= batch_size:
+                task_count += _insert_tasks(pending, rng, now, days, batch_size)
+                pending = []
+    if pending:
+        task_count += _insert_tasks(pending, rng, now, days, batch_size)
+
+    # bulk_create skips the save signals that normally keep summaries fresh.
+    invalidate_summaries(admin_ids=admin_ids)
+    return {"admins": len(admin_ids), "users": len(users), "tasks": task_count}
+
+
+def _insert_tasks(tasks, rng, now, days, batch_size):
+    created = Task.objects.bulk_create(tasks, batch_size=batch_size)
+    # created_at is auto_now_add, so backdate it in a second pass.
+    for task in created:
+        task.created_at = now - timedelta(seconds=rng.randint(0, days * 86400))
+        task.updated_at = task.created_at
+    Task.objects.bulk_update(created, ["created_at", "updated_at"], batch_size=batch_size)
+    index_task_ids([task.pk for task in created])
+    return len(created)
@@ -0,0 +1,61 @@
+# tasks/serializers.py
+
+from rest_framework.exceptions import ParseError
+
+
+class InvalidFields(ParseError):
+    default_detail = "Invalid fields"
+
+
+class ValuesSerializer:
+    """
+    Lean JSON serializer: rows come straight from ``QuerySet.values()``, so
+    no model instances or DRF field objects are built per row.
+
+    ``default_fields`` are sent unless the client asks for a subset with
+    ``?fields=a,b,c``. Output keys are the ORM lookups themselves, e.g.
+    ``assigned_to__username``.
+    """
+    allowed_fields = ()
+    fields_query_param = "fields"
+
+    def __init__(self, default_fields):
+        self.default_fields = tuple(default_fields)
+
+    def select(self, request, required=("id",)):
+        """The fields to send for ``request``; ``required`` is always included."""
+        params = getattr(request, "query_params", request.GET)
+        raw = params.get(self.fields_query_param) or ""
+        requested = [name.strip() for name in raw.split(",") if name.strip()]
+        if not requested:
+            return self.default_fields
+        unknown = [name for name in requested if name not in self.allowed_fields]
+        if unknown:
+            raise InvalidFields(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Choose from {', '.join(self.allowed_fields)}"
+            )
+        return tuple(dict.fromkeys([*required, *requested]))
+
+    def values(self, queryset, request, required=("id",)):
+        return queryset.values(*self.select(request, required))
+
+
+class TaskSerializer(ValuesSerializer):
+    allowed_fields = (
+        "id", "title", "description", "assigned_to_id", "assigned_to__username",
+        "assigned_to__email", "created_by_id", "created_by__username", "due_date",
+        "status", "worked_hours", "completion_report", "created_at", "updated_at",
+    )
+
+
+class UserSerializer(ValuesSerializer):
+    allowed_fields = (
+        "id", "username", "email", "first_name", "last_name", "role", "is_active",
+        "assigned_admin_id", "assigned_admin__username", "date_joined", "last_login",
+    )
+
+
+class AdminSerializer(UserSerializer):
+    # Only valid on querysets annotated with the count, as AdminListView's is.
+    allowed_fields = UserSerializer.allowed_fields + ("assigned_users_count",)
@@ -0,0 +1,169 @@
+# tasks/signals.py
+
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .authentication import token_version_cache_key
+from .events import publish_tasks
+from .models import CustomUser, Task, managed_users_cache_key
+from .rollups import apply_deltas, deltas_between, snapshot
+from .search import SEARCH_FIELDS, index_task_ids, unindex_task_ids
+from .summary import invalidate_summaries
+from .sync import record_scope_change, record_tombstones
+
+# Saves that only touch these fields cannot change any dashboard counter.
+SUMMARY_NEUTRAL_USER_FIELDS = {"last_login", "password"}
+# CustomUser fields whose change must revoke previously issued JWTs.
+TOKEN_CLAIM_FIELDS = ("role", "assigned_admin", "password", "is_active")
+# Task fields that feed the dashboard summaries or the daily rollups.
+TASK_TRACKED_FIELDS = ("assigned_to", "status", "worked_hours")
+
+
+def _touches(update_fields, field):
+    return update_fields is None or field in update_fields
+
+
+# ---------------- DASHBOARD SUMMARY ---------------- #
+
+@receiver(pre_save, sender=Task)
+def remember_previous_task_state(sender, instance, update_fields=None, **kwargs):
+    instance._previous_state = None
+    if instance.pk and any(_touches(update_fields, f) for f in TASK_TRACKED_FIELDS):
+        instance._previous_state = (
+            Task.objects.filter(pk=instance.pk)
+            .values_list("assigned_to_id", "status", "worked_hours", "created_at", "updated_at")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_summaries(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", None)
+    user_ids = {instance.assigned_to_id, previous[0] if previous else None}
+    admin_ids = CustomUser.objects.filter(pk__in=[pk for pk in user_ids if pk]).values_list(
+        "assigned_admin_id", flat=True
+    )
+    invalidate_summaries(user_ids=user_ids, admin_ids=admin_ids)
+
+
+# ---------------- ROLLUPS ---------------- #
+
+@receiver(post_save, sender=Task)
+def update_task_rollups(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if not created and previous is None:
+        return
+    apply_deltas(deltas_between(previous, snapshot(instance)))
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_from_rollups(sender, instance, **kwargs):
+    apply_deltas(deltas_between(snapshot(instance), None), create=False)
+
+
+# ---------------- DELTA SYNC ---------------- #
+
+@receiver(post_save, sender=Task)
+def tombstone_reassigned_task(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if previous and previous[0] != instance.assigned_to_id:
+        record_tombstones([(instance.pk, previous[0])])
+
+
+@receiver(post_delete, sender=Task)
+def tombstone_deleted_task(sender, instance, **kwargs):
+    record_tombstones([(instance.pk, instance.assigned_to_id)])
+
+
+@receiver(post_save, sender=CustomUser)
+def record_user_scope_change(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, "_previous_token_claims", None)
+    if previous and previous[1] != instance.assigned_admin_id:
+        record_scope_change([instance.pk], previous[1], instance.assigned_admin_id)
+
+
+# ---------------- SEARCH INDEX ---------------- #
+
+@receiver(post_save, sender=Task)
+def index_saved_task(sender, instance, update_fields=None, **kwargs):
+    if any(_touches(update_fields, f) for f in SEARCH_FIELDS):
+        index_task_ids([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def unindex_deleted_task(sender, instance, **kwargs):
+    unindex_task_ids([instance.pk])
+
+
+# ---------------- EVENT STREAMS ---------------- #
+
+@receiver(post_save, sender=Task)
+def publish_task_event(sender, instance, created, **kwargs):
+    publish_tasks([instance], created=created)
+
+
+# ---------------- USERS ---------------- #
+
+@receiver(pre_save, sender=CustomUser)
+def remember_previous_user_state(sender, instance, update_fields=None, **kwargs):
+    instance._previous_assigned_admin_id = None
+    instance._previous_token_claims = None
+    if instance.pk and any(_touches(update_fields, f) for f in TOKEN_CLAIM_FIELDS):
+        previous = (
+            CustomUser.objects.filter(pk=instance.pk)
+            .values_list(*TOKEN_CLAIM_FIELDS)
+            .first()
+        )
+        if previous:
+            instance._previous_token_claims = previous
+            instance._previous_assigned_admin_id = previous[1]
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_summaries(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= SUMMARY_NEUTRAL_USER_FIELDS:
+        return
+    admin_ids = {
+        instance.assigned_admin_id,
+        getattr(instance, "_previous_assigned_admin_id", None),
+    }
+    if instance.role == "admin":
+        admin_ids.add(instance.pk)
+    invalidate_summaries(user_ids=[instance.pk], admin_ids=admin_ids)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_managed_users(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= SUMMARY_NEUTRAL_USER_FIELDS:
+        return
+    admin_ids = {
+        instance.pk,
+        instance.assigned_admin_id,
+        getattr(instance, "_previous_assigned_admin_id", None),
+    }
+    cache.delete_many([managed_users_cache_key(pk) for pk in admin_ids if pk])
+
+
+# ---------------- TOKEN VERSIONS ---------------- #
+
+@receiver(post_save, sender=CustomUser)
+def bump_token_version(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_token_claims", None)
+    if created or previous is None:
+        return
+    current = tuple(
+        getattr(instance, CustomUser._meta.get_field(f).attname) for f in TOKEN_CLAIM_FIELDS
+    )
+    if current != previous:
+        CustomUser.objects.filter(pk=instance.pk).update(token_version=F("token_version") + 1)
+        instance.refresh_from_db(fields=["token_version"])
+        cache.delete(token_version_cache_key(instance.pk))
+
+
+@receiver(post_delete, sender=CustomUser)
+def forget_token_version(sender, instance, **kwargs):
+    cache.delete(token_version_cache_key(instance.pk))
@@ -0,0 +1,109 @@
+# tasks/summary.py
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from .models import CustomUser, Task
+
+SUMMARY_CACHE_TIMEOUT = getattr(settings, "TASKS_SUMMARY_CACHE_TIMEOUT", 300)
+
+
+# ---------------- CACHE KEYS ---------------- #
+
+def global_summary_key():
+    return "tasks:summary:global"
+
+
+def admin_summary_key(admin_id):
+    return f"tasks:summary:admin:{admin_id}"
+
+
+def user_summary_key(user_id):
+    return f"tasks:summary:user:{user_id}"
+
+
+def summary_key_for(user):
+    if user.role == "superadmin":
+        return global_summary_key()
+    if user.role == "admin":
+        return admin_summary_key(user.pk)
+    return user_summary_key(user.pk)
+
+
+# ---------------- AGGREGATION ---------------- #
+
+TASK_COUNTS = {
+    "total_tasks": Count("id"),
+    "completed_tasks": Count("id", filter=Q(status="completed")),
+}
+USER_COUNTS = {
+    "total_admins": Count("id", filter=Q(role="admin")),
+    "total_users": Count("id", filter=Q(role="user")),
+}
+
+
+def _task_counts(tasks):
+    return tasks.aggregate(**TASK_COUNTS)
+
+
+def compute_summary(user):
+    """Run one conditional-aggregation query per table for the user's scope."""
+    if user.role == "superadmin":
+        summary = CustomUser.objects.aggregate(**USER_COUNTS)
+        summary.update(_task_counts(Task.objects.for_user(user)))
+    elif user.role == "admin":
+        summary = {"total_users": len(user.managed_user_ids())}
+        summary.update(_task_counts(Task.objects.for_user(user)))
+    else:
+        summary = _task_counts(Task.objects.for_user(user))
+    return summary
+
+
+async def acompute_summary(user):
+    """Async ``compute_summary``; the user and task aggregates are awaited together."""
+    # for_user() may have to load an admin's scope, which is a sync query.
+    tasks = await sync_to_async(Task.objects.for_user)(user)
+    if user.role == "superadmin":
+        people, counts = await asyncio.gather(
+            CustomUser.objects.aaggregate(**USER_COUNTS),
+            tasks.aaggregate(**TASK_COUNTS),
+        )
+        return {**people, **counts}
+    if user.role == "admin":
+        user_ids, counts = await asyncio.gather(
+            sync_to_async(user.managed_user_ids)(),
+            tasks.aaggregate(**TASK_COUNTS),
+        )
+        return {"total_users": len(user_ids), **counts}
+    return await tasks.aaggregate(**TASK_COUNTS)
+
+
+def get_summary(user):
+    key = summary_key_for(user)
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_summary(user)
+        cache.set(key, summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+async def aget_summary(user):
+    key = summary_key_for(user)
+    summary = await cache.aget(key)
+    if summary is None:
+        summary = await acompute_summary(user)
+        await cache.aset(key, summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+# ---------------- INVALIDATION ---------------- #
+
+def invalidate_summaries(user_ids=(), admin_ids=()):
+    """Drop the global summary plus every listed user/admin scope."""
+    keys = [global_summary_key()]
+    keys += [user_summary_key(pk) for pk in set(user_ids) if pk]
+    keys += [admin_summary_key(pk) for pk in set(admin_ids) if pk]
+    cache.delete_many(keys)
@@ -0,0 +1,243 @@
+# tasks/sync.py
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import CustomUser, Task, TaskScopeEntry, TaskTombstone
+
+SYNC_PAGE_SIZE = getattr(settings, "TASKS_SYNC_PAGE_SIZE", 500)
+SYNC_SETTLE_SECONDS = getattr(settings, "TASKS_SYNC_SETTLE_SECONDS", 2)
+TOMBSTONE_RETENTION_DAYS = getattr(settings, "TASKS_TOMBSTONE_RETENTION_DAYS", 30)
+SCOPE_CHANGE_BATCH_SIZE = 1000
+
+
+class SyncCursorError(ValueError):
+    pass
+
+
+class SyncCursorExpired(SyncCursorError):
+    pass
+
+
+# ---------------- TOMBSTONES ---------------- #
+
+def record_tombstones(removed):
+    """Store a tombstone for each ``(task_id, assignee_id)`` that left its scope."""
+    removed = [(task_id, assignee_id) for task_id, assignee_id in removed if task_id]
+    if not removed:
+        return
+    admin_ids = dict(
+        CustomUser.objects.filter(pk__in={assignee_id for _, assignee_id in removed})
+        .values_list("id", "assigned_admin_id")
+    )
+    now = timezone.now()
+    TaskTombstone.objects.bulk_create([
+        TaskTombstone(
+            task_id=task_id,
+            assignee_id=assignee_id,
+            admin_id=admin_ids.get(assignee_id),
+            deleted_at=now,
+        )
+        for task_id, assignee_id in removed
+    ])
+
+
+def tombstones_for(user):
+    if user.role == "superadmin":
+        return TaskTombstone.objects.all()
+    if user.role == "admin":
+        return TaskTombstone.objects.filter(
+            Q(admin_id=user.pk) | Q(assignee_id__in=user.managed_user_ids())
+        )
+    return TaskTombstone.objects.filter(assignee_id=user.pk)
+
+
+def prune_tombstones(days=TOMBSTONE_RETENTION_DAYS):
+    """Drop tombstones and scope entries older than ``days`` days."""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    entries, _ = TaskScopeEntry.objects.filter(entered_at__lt=cutoff).delete()
+    return deleted + entries
+
+
+# ---------------- SCOPE CHANGES ---------------- #
+
+def record_scope_change(user_ids, old_admin_id, new_admin_id):
+    """
+    The tasks of ``user_ids`` moved from ``old_admin_id``'s scope to
+    ``new_admin_id``'s without being edited: tombstone them for the old
+    admin and record scope entries for the new one, in batches.
+    """
+    if old_admin_id == new_admin_id:
+        return
+    now = timezone.now()
+    task_ids = (
+        Task.objects.filter(assigned_to_id__in=user_ids)
+        .order_by()
+        .values_list("id", "assigned_to_id")
+        .iterator(chunk_size=SCOPE_CHANGE_BATCH_SIZE)
+    )
+    batch = []
+    for row in task_ids:
+        batch.append(row)
+        if len(batch) == SCOPE_CHANGE_BATCH_SIZE:
+            _record_scope_batch(batch, old_admin_id, new_admin_id, now)
+            batch = []
+    _record_scope_batch(batch, old_admin_id, new_admin_id, now)
+
+
+def _record_scope_batch(rows, old_admin_id, new_admin_id, now):
+    if old_admin_id and rows:
+        TaskTombstone.objects.bulk_create([
+            TaskTombstone(task_id=task_id, assignee_id=assignee_id, admin_id=old_admin_id,
+                          deleted_at=now)
+            for task_id, assignee_id in rows
+        ])
+    if new_admin_id and rows:
+        TaskScopeEntry.objects.bulk_create([
+            TaskScopeEntry(task_id=task_id, admin_id=new_admin_id, entered_at=now)
+            for task_id, _ in rows
+        ])
+
+
+def scope_entries_for(user):
+    # Only an admin's scope grows without its tasks changing.
+    if user.role == "admin":
+        return TaskScopeEntry.objects.filter(admin_id=user.pk)
+    return TaskScopeEntry.objects.none()
+
+
+# ---------------- CURSORS ---------------- #
+
+def _position(value, pk):
+    return [value.isoformat(), pk]
+
+
+def encode_cursor(changed, deleted, entered):
+    payload = json.dumps({"c": changed, "d": deleted, "e": entered})
+    return urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(encoded):
+    """
+    Return the ``(timestamp, id)`` positions of the change, tombstone and
+    scope entry streams.
+    """
+    try:
+        payload = json.loads(urlsafe_b64decode(encoded.encode()))
+        # Cursors issued before scope entries existed resume them with tombstones.
+        payload.setdefault("e", payload["d"])
+        positions = []
+        for key in ("c", "d", "e"):
+            if payload[key] is None:
+                positions.append(None)
+                continue
+            value, pk = payload[key]
+            value = parse_datetime(value)
+            if value is None:
+                raise ValueError(encoded)
+            positions.append((value, int(pk)))
+    except (TypeError, ValueError, KeyError):
+        raise SyncCursorError("Invalid cursor")
+    return positions
+
+
+def _after(queryset, field, position):
+    if position is None:
+        return queryset
+    value, pk = position
+    return queryset.filter(
+        Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+    )
+
+
+def _marker_page(markers, field, position, settled, page_size):
+    """
+    One page of ``(id, task_id, timestamp)`` marker rows (tombstones or scope
+    entries) after ``position``, the position to resume from, and whether
+    more remain.
+    """
+    rows = list(
+        _after(markers.filter(**{f"{field}__lte": settled}), field, position)
+        .order_by(field, "id")
+        .values_list("id", "task_id", field)[:page_size + 1]
+    )
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, (rows[-1][2], rows[-1][0]), True
+    # Everything up to the settle line has been seen; moving the position
+    # there keeps an idle client's cursor from ever expiring.
+    return rows, (settled, 0), False
+
+
+# ---------------- CHANGES ---------------- #
+
+def changes_since(user, cursor, fields, page_size=SYNC_PAGE_SIZE):
+    """
+    One page of the tasks created or updated in ``user``'s scope after
+    ``cursor`` or moved into it, plus the ids of tasks that left it.
+
+    Without a cursor every task in scope is returned, so a first sync is a
+    full download paged through the same cursor. Rows younger than the
+    settle window are held back until the transactions writing them have
+    had time to commit; otherwise the cursor could pass them unseen.
+    """
+    changed_position, deleted_position, entered_position = (
+        decode_cursor(cursor) if cursor else (None, None, None)
+    )
+    now = timezone.now()
+    if deleted_position and deleted_position[0] < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+        raise SyncCursorExpired("Cursor is older than the tombstone retention; sync from scratch")
+    settled = now - timedelta(seconds=SYNC_SETTLE_SECONDS)
+
+    tasks = _after(
+        Task.objects.for_user(user).filter(updated_at__lte=settled), "updated_at", changed_position
+    )
+    changed = list(tasks.order_by("updated_at", "id").values(*fields)[:page_size + 1])
+    has_more = len(changed) > page_size
+    changed = changed[:page_size]
+    if changed:
+        changed_position = (changed[-1]["updated_at"], changed[-1]["id"])
+
+    if cursor is None:
+        # A full download has nothing to delete or add, so those streams start now.
+        rows, entries = [], []
+        deleted_position = entered_position = (settled, 0)
+    else:
+        rows, deleted_position, more_deleted = _marker_page(
+            tombstones_for(user), "deleted_at", deleted_position, settled, page_size
+        )
+        entries, entered_position, more_entered = _marker_page(
+            scope_entries_for(user), "entered_at", entered_position, settled, page_size
+        )
+        has_more = has_more or more_deleted or more_entered
+
+    deleted = []
+    if rows:
+        # A task moved between two users in scope is a change, not a removal.
+        task_ids = {task_id for _, task_id, _ in rows}
+        still_visible = set(
+            Task.objects.for_user(user).filter(pk__in=task_ids).values_list("id", flat=True)
+        )
+        deleted = sorted(task_ids - still_visible)
+    if entries:
+        # Tasks that entered the scope unchanged are sent as changes.
+        sent = {task["id"] for task in changed}
+        entered_ids = {task_id for _, task_id, _ in entries} - sent
+        changed += Task.objects.for_user(user).filter(pk__in=entered_ids).values(*fields)
+
+    return {
+        "changed": changed,
+        "deleted": deleted,
+        "cursor": encode_cursor(
+            _position(*changed_position) if changed_position else None,
+            _position(*deleted_position),
+            _position(*entered_position),
+        ),
+        "has_more": has_more,
+    }
@@ -0,0 +1,37 @@
+# tasks/templatetags/task_fragments.py
+
+from hashlib import md5
+
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, "TASKS_FRAGMENT_CACHE_TIMEOUT", 300)
+
+
+@register.simple_tag
+def fragment_timeout():
+    """Seconds a ``{% cache %}`` fragment lives; use as ``{% fragment_timeout as ttl %}``."""
+    return FRAGMENT_CACHE_TIMEOUT
+
+
+@register.simple_tag(takes_context=True)
+def fragment_scope(context):
+    """The viewer's role scope, so one scope's fragments are never served to another."""
+    user = context["request"].user
+    if user.role == "superadmin":
+        return "global"
+    return f"{user.role}:{user.pk}"
+
+
+@register.simple_tag
+def fragment_version(tasks):
+    """
+    Digest of the id and ``updated_at`` of every task on the page. It
+    changes whenever a row is edited, added or removed, so a table cached
+    under it never needs explicit invalidation. A renamed assignee is not
+    covered and shows once the fragment expires.
+    """
+    rows = ",".join(f"{task.pk}:{task.updated_at.isoformat()}" for task in tasks)
+    return md5(rows.encode(), usedforsecurity=False).hexdigest()
@@ -0,0 +1,36 @@
+# tasks/test_archive.py
+
+from django.db.models import Sum
+from django.test import TestCase
+from .archive import archive_tasks
+from .models import ArchivedTask, TaskRollup
+from .rollups import rebuild_rollups
+from .seed import seed_dataset
+
+
+def rollup_totals():
+    return TaskRollup.objects.aggregate(
+        assigned=Sum("assigned_tasks"),
+        completed=Sum("completed_tasks"),
+        hours=Sum("worked_hours"),
+    )
+
+
+class ArchivedRollupTests(TestCase):
+    """Archived tasks keep counting towards the rollups, even after a rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(admins=2, users_per_admin=3, tasks_per_user=20, prefix="a", days=730)
+
+    def test_rebuild_after_archiving_keeps_archived_totals(self):
+        rebuild_rollups()
+        before = rollup_totals()
+
+        moved = archive_tasks(days=365)
+        self.assertGreater(moved, 0)
+        self.assertEqual(ArchivedTask.objects.count(), moved)
+        self.assertEqual(rollup_totals(), before)
+
+        rebuild_rollups()
+        self.assertEqual(rollup_totals(), before)
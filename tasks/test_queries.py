@@ -0,0 +1,87 @@
+# tasks/test_queries.py
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from .models import CustomUser, Task
+from .seed import seed_dataset
+
+# View name -> the roles (seeded usernames) that may open it.
+LIST_VIEWS = {
+    "task_list_view": ("q_superadmin", "q_admin0", "q_user0_0"),
+    "task_report_view": ("q_superadmin", "q_admin0", "q_user0_0"),
+    "user_task_list_view": ("q_user0_0",),
+}
+FORMATS = ("text/html", "application/json")
+
+
+def add_tasks(per_user):
+    """Give every seeded user ``per_user`` more completed tasks."""
+    users = CustomUser.objects.filter(role="user", username__startswith="q_")
+    Task.objects.bulk_create([
+        Task(
+            title=f"task {user.pk}-{n}",
+            description="Long description.",
+            assigned_to=user,
+            created_by_id=user.assigned_admin_id,
+            due_date=timezone.localdate(),
+            status="completed",
+            completion_report="Done.",
+            worked_hours=Decimal("1.50"),
+        )
+        for user in users
+        for n in range(per_user)
+    ])
+
+
+class TaskListQueryCountTests(TestCase):
+    """
+    The task list pages must not run a query per row (N+1): each view,
+    role and renderer runs as many queries for one task per user as for
+    a full page of them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(admins=2, users_per_admin=2, tasks_per_user=0, prefix="q")
+        cls.users = {user.username: user for user in CustomUser.objects.all()}
+        # Fewer rows than a page, so a per-row query would change the count.
+        add_tasks(1)
+
+    def cases(self):
+        for view_name, usernames in LIST_VIEWS.items():
+            for username in usernames:
+                for accept in FORMATS:
+                    yield view_name, username, accept
+
+    def prepare(self, username):
+        # Summaries, scopes and template fragments would otherwise hide queries.
+        cache.clear()
+        self.client.force_login(self.users[username])
+
+    def fetch(self, view_name, accept):
+        response = self.client.get(reverse(view_name), HTTP_ACCEPT=accept)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_is_independent_of_task_volume(self):
+        expected = {}
+        for view_name, username, accept in self.cases():
+            self.prepare(username)
+            with CaptureQueriesContext(connection) as queries:
+                self.fetch(view_name, accept)
+            expected[view_name, username, accept] = len(queries)
+
+        add_tasks(30)
+        for view_name, username, accept in self.cases():
+            with self.subTest(view=view_name, user=username, accept=accept):
+                self.prepare(username)
+                with self.assertNumQueries(expected[view_name, username, accept]):
+                    response = self.fetch(view_name, accept)
+                if accept == "application/json":
+                    self.assertGreater(len(response.json()["tasks"]), 1)
@@ -0,0 +1,59 @@
+# tasks/test_sync.py
+
+from unittest import mock
+
+from django.test import TestCase
+from .bulk import release_assigned_users
+from .models import CustomUser, Task
+from .seed import seed_dataset
+from .sync import changes_since
+
+FIELDS = ("id", "updated_at")
+
+
+def sync(user, cursor=None):
+    """Every change page after ``cursor``: (changed ids, deleted ids, new cursor)."""
+    changed, deleted = set(), set()
+    while True:
+        page = changes_since(user, cursor, FIELDS, page_size=7)
+        changed |= {task["id"] for task in page["changed"]}
+        deleted |= set(page["deleted"])
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            return changed, deleted, cursor
+
+
+@mock.patch("tasks.sync.SYNC_SETTLE_SECONDS", 0)
+class ScopeChangeSyncTests(TestCase):
+    """Tasks of a user moved to another admin leave one scope and enter the other."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(admins=2, users_per_admin=2, tasks_per_user=10, prefix="s")
+
+    def setUp(self):
+        self.old_admin = CustomUser.objects.get(username="s_admin0")
+        self.new_admin = CustomUser.objects.get(username="s_admin1")
+        self.cursors = {admin: sync(admin)[2] for admin in (self.old_admin, self.new_admin)}
+
+    def assert_moved(self, task_ids):
+        changed, deleted, _ = sync(self.old_admin, self.cursors[self.old_admin])
+        self.assertEqual(changed, set())
+        self.assertEqual(deleted, task_ids)
+        changed, deleted, _ = sync(self.new_admin, self.cursors[self.new_admin])
+        self.assertEqual(changed, task_ids)
+        self.assertEqual(deleted, set())
+
+    def test_assigned_admin_edit(self):
+        user = CustomUser.objects.filter(assigned_admin=self.old_admin).first()
+        user.assigned_admin = self.new_admin
+        user.save()
+        self.assert_moved(set(Task.objects.filter(assigned_to=user).values_list("id", flat=True)))
+
+    def test_release_assigned_users(self):
+        task_ids = set(
+            Task.objects.filter(assigned_to__assigned_admin=self.old_admin)
+            .values_list("id", flat=True)
+        )
+        release_assigned_users(self.old_admin, self.new_admin)
+        self.assert_moved(task_ids)
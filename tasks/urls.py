@@ -4,8 +4,12 @@ from .views import (
     LoginView, LogoutView, DashboardView,
     UserListView, UserCreateView, UserDeleteView,
     AdminListView, AdminCreateView, AdminDeleteView,
-    TaskListView, TaskCreateView, TaskReportView,
-    UserTaskListView, TaskUpdateView
+    TaskListView, TaskCreateView, TaskBulkCreateView, TaskReportView, TaskRollupReportView,
+    UserTaskListView, TaskUpdateView, TaskBulkUpdateView, TaskChangesView, TaskSearchView,
+    JobCreateView, JobListView, JobDetailView, JobDownloadView, MetricsView
+)
+from .async_views import (
+    AsyncDashboardView, AsyncTaskListView, AsyncTaskReportView, TaskEventStreamView,
 )
 
 urlpatterns = [
@@ -27,9 +31,29 @@ urlpatterns = [
     # Task Management
     path("tasks/", TaskListView.as_view(), name="task_list_view"),
     path("tasks/create/", TaskCreateView.as_view(), name="task_create_view"),
+    path("tasks/bulk/create/", TaskBulkCreateView.as_view(), name="task_bulk_create"),
     path("tasks/reports/", TaskReportView.as_view(), name="task_report_view"),
+    path("tasks/reports/rollups/", TaskRollupReportView.as_view(), name="task_rollup_report"),
+    path("tasks/changes/", TaskChangesView.as_view(), name="task_changes"),
+    path("tasks/search/", TaskSearchView.as_view(), name="task_search"),
 
     # User-specific Task Views
     path("user/tasks/", UserTaskListView.as_view(), name="user_task_list_view"),
     path("tasks/update/<int:task_id>", TaskUpdateView.as_view(), name="task_update_view"),
+    path("tasks/bulk/update/", TaskBulkUpdateView.as_view(), name="task_bulk_update"),
+
+    # Async (ASGI) read endpoints, JSON only
+    path("async/dashboard/", AsyncDashboardView.as_view(), name="async_dashboard"),
+    path("async/tasks/", AsyncTaskListView.as_view(), name="async_task_list"),
+    path("async/tasks/reports/", AsyncTaskReportView.as_view(), name="async_task_report"),
+    path("async/tasks/events/", TaskEventStreamView.as_view(), name="task_event_stream"),
+
+    # Background jobs
+    path("jobs/", JobListView.as_view(), name="job_list"),
+    path("jobs/create/", JobCreateView.as_view(), name="job_create"),
+    path("jobs/<int:pk>/", JobDetailView.as_view(), name="job_detail"),
+    path("jobs/<int:pk>/download/", JobDownloadView.as_view(), name="job_download"),
+
+    # Monitoring
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
@@ -1,20 +1,66 @@
 
 from datetime import datetime
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
+from django.db.models import Count
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ParseError
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.renderers import TemplateHTMLRenderer, JSONRenderer
+from rest_framework.renderers import TemplateHTMLRenderer
+from rest_framework import status
 from rest_framework.permissions import AllowAny
-from .models import CustomUser, Task
+from .bulk import (
+    BulkPayloadError, apply_task_updates, build_task_updates, build_tasks,
+    create_tasks, read_rows,
+)
+from .conditional import conditional_response
+from .exports import (
+    EXPORT_FILTER_PARAMS, EXPORT_FORMATS, ExportFilterError, completed_tasks,
+    completed_tasks_for_export, export_response,
+)
+from .jobs import active_job, enqueue, export_path
+from .middleware import view_metrics
+from .models import CustomUser, Job, Task
+from .pagination import UserPagination, paginated_response
+from .permissions import RoleRequiredMixin
+from .renderers import FastJSONRenderer
+from .rollups import ROLLUP_GROUPS, rollup_report, rollups_for
+from .search import SEARCH_MAX_RESULTS, search_tasks, search_terms
+from .serializers import AdminSerializer, TaskSerializer, UserSerializer
+from .summary import get_summary
+from .sync import SYNC_PAGE_SIZE, SyncCursorError, SyncCursorExpired, changes_since
+
+# Columns returned for each list when the client asks for JSON.
+TASK_LIST_FIELDS = (
+    "id", "title", "assigned_to_id", "assigned_to__username", "created_by_id",
+    "due_date", "status", "worked_hours", "created_at", "updated_at",
+)
+TASK_REPORT_FIELDS = TASK_LIST_FIELDS + ("assigned_to__email", "completion_report")
+USER_LIST_FIELDS = (
+    "id", "username", "email", "first_name", "last_name",
+    "assigned_admin_id", "assigned_admin__username", "date_joined",
+)
+ADMIN_LIST_FIELDS = (
+    "id", "username", "email", "first_name", "last_name",
+    "assigned_users_count", "date_joined",
+)
+# JSON bodies are built by these from values() rows; ?fields= narrows them.
+TASK_LIST_SERIALIZER = TaskSerializer(TASK_LIST_FIELDS)
+TASK_REPORT_SERIALIZER = TaskSerializer(TASK_REPORT_FIELDS)
+TASK_DETAIL_SERIALIZER = TaskSerializer(TaskSerializer.allowed_fields)
+USER_LIST_SERIALIZER = UserSerializer(USER_LIST_FIELDS)
+ADMIN_LIST_SERIALIZER = AdminSerializer(ADMIN_LIST_FIELDS)
 
 
 # ---------------- AUTH ---------------- #
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/login.html"
 
     def get(self, request):
@@ -33,6 +79,8 @@ class LoginView(APIView):
 
 
 class LogoutView(APIView):
+    writes_on_get = True
+
     def get(self, request):
         logout(request)
         return redirect("login")
@@ -41,68 +89,52 @@ class LogoutView(APIView):
 # ---------------- DASHBOARD ---------------- #
 
 class DashboardView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/dashboard.html"
 
     def get(self, request):
-        user = request.user
-        context = {}
-
-        if user.role == "superadmin":
-            context["total_admins"] = CustomUser.objects.filter(role="admin").count()
-            context["total_users"] = CustomUser.objects.filter(role="user").count()
-            context["total_tasks"] = Task.objects.count()
-            context["completed_tasks"] = Task.objects.filter(status="completed").count()
-            context["all_tasks"] = Task.objects.all()
-        elif user.role == "admin":
-            context["total_users"] = CustomUser.objects.filter(assigned_admin=user).count()
-            context["total_tasks"] = Task.objects.filter(
-                assigned_to__assigned_admin=user
-            ).count()
-            context["completed_tasks"] = Task.objects.filter(
-                assigned_to__assigned_admin=user, status="completed"
-            ).count()
-            context["all_tasks"] = Task.objects.filter(assigned_to__assigned_admin=user)
-        else:
-            context["total_tasks"] = Task.objects.filter(assigned_to=user).count()
-            context["completed_tasks"] = Task.objects.filter(
-                assigned_to=user, status="completed"
-            ).count()
-            context["all_tasks"] = Task.objects.filter(assigned_to=user)
-
-        return Response(context)
+        return Response(get_summary(request.user))
 
 
 # ---------------- USER MANAGEMENT (superadmin only) ---------------- #
 
-class UserListView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+def queue_account_deletion(request, account, kind, **payload):
+    """
+    Deactivate ``account`` now, which also revokes its tokens, and leave the
+    cascading delete of its tasks to a background job.
+    """
+    if account.is_active:
+        account.is_active = False
+        account.save(update_fields=["is_active"])
+    return active_job(kind, user_id=account.pk) or enqueue(
+        kind, {"user_id": account.pk, **payload}, user_id=request.user.pk
+    )
+
+
+class UserListView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/user_list.html"
 
     def get(self, request):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-        users = CustomUser.objects.filter(role="user")
-        return Response({"users": users})
+        users = CustomUser.objects.filter(role="user").select_related("assigned_admin")
+        return paginated_response(
+            request, self, users, "users", USER_LIST_SERIALIZER, pagination_class=UserPagination
+        )
 
 
-class UserCreateView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+class UserCreateView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/user_form.html"
 
     def get(self, request):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
         admins = CustomUser.objects.filter(role="admin")
+        if request.accepted_renderer.format == "json":
+            admins = admins.values("id", "username")
         return Response({"admins": admins})
 
     def post(self, request):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-
         username = request.data.get("username")
         password = request.data.get("password")
         email = request.data.get("email")
@@ -129,48 +161,42 @@ class UserCreateView(APIView):
             return Response({}, template_name="tasks/user_form.html")
 
 
-class UserDeleteView(APIView):
+class UserDeleteView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    writes_on_get = True
 
     def get(self, request, pk):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-
         user = get_object_or_404(CustomUser, pk=pk, role="user")
-        user.delete()
-        messages.success(request, "User deleted successfully")
+        queue_account_deletion(request, user, "delete_user")
+        messages.success(request, f"Deletion of {user.username} has been queued")
         return redirect("user_list")
 
 
 # ---------------- ADMIN MANAGEMENT ---------------- #
 
-class AdminListView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+class AdminListView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/admin_list.html"
 
     def get(self, request):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-        admins = CustomUser.objects.filter(role="admin")
-        return Response({"admins": admins})
+        admins = CustomUser.objects.filter(role="admin").annotate(
+            assigned_users_count=Count("assigned_users")
+        )
+        return paginated_response(
+            request, self, admins, "admins", ADMIN_LIST_SERIALIZER, pagination_class=UserPagination
+        )
 
 
-class AdminCreateView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+class AdminCreateView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/admin_form.html"
 
     def get(self, request):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
         return Response({})
 
     def post(self, request):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-
         username = request.data.get("username")
         password = request.data.get("password")
         email = request.data.get("email")
@@ -193,57 +219,58 @@ class AdminCreateView(APIView):
             return Response({}, template_name="tasks/admin_form.html")
 
 
-class AdminDeleteView(APIView):
+class AdminDeleteView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    writes_on_get = True
 
     def get(self, request, pk):
-        if request.user.role != "superadmin":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-
         admin = get_object_or_404(CustomUser, pk=pk, role="admin")
-        admin.delete()
-        messages.success(request, "Admin deleted successfully")
+        reassign_to = request.query_params.get("reassign_to")
+        if reassign_to and not (
+            reassign_to.isdigit()
+            and CustomUser.objects.filter(pk=reassign_to, role="admin", is_active=True)
+            .exclude(pk=admin.pk)
+            .exists()
+        ):
+            messages.error(request, "reassign_to must be another active admin")
+            return redirect("admin_list")
+        # Without reassign_to the admin's users are left unassigned.
+        queue_account_deletion(
+            request, admin, "delete_admin", reassign_to=int(reassign_to) if reassign_to else None
+        )
+        messages.success(request, f"Deletion of {admin.username} has been queued")
         return redirect("admin_list")
 
 
 # ---------------- TASK MANAGEMENT ---------------- #
 
 class TaskListView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/task_list.html"
 
     def get(self, request):
-        if request.user.role == "superadmin":
-            tasks = Task.objects.all()
-        elif request.user.role == "admin":
-            tasks = Task.objects.filter(assigned_to__assigned_admin=request.user)
-        else:
-            tasks = Task.objects.filter(assigned_to=request.user)
-
-        return Response({"tasks": tasks})
+        tasks = Task.objects.for_user(request.user)
+        return conditional_response(request, tasks, lambda: paginated_response(
+            request, self, tasks.for_list(), "tasks", TASK_LIST_SERIALIZER
+        ))
 
 
-class TaskCreateView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+class TaskCreateView(RoleRequiredMixin, APIView):
+    allowed_roles = ("admin",)
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/task_form.html"
 
     def get(self, request):
-        if request.user.role not in ["admin"]:
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-
         if request.user.role == "superadmin":
             users = CustomUser.objects.filter(role="user")
         else:  
-            users = CustomUser.objects.filter(assigned_admin=request.user, role="user")
+            users = CustomUser.objects.filter(assigned_admin_id=request.user.pk, role="user")
 
+        if request.accepted_renderer.format == "json":
+            users = users.values("id", "username")
         return Response({"users": users})
 
     def post(self, request):
-        if request.user.role not in ["admin"]:
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-
         title = request.data.get("title")
         description = request.data.get("description")
         assigned_to_id = request.data.get("assigned_to")
@@ -265,47 +292,138 @@ class TaskCreateView(APIView):
             return Response({}, template_name="tasks/task_form.html")
 
 
+class TaskBulkCreateView(RoleRequiredMixin, APIView):
+    allowed_roles = ("admin",)
+    renderer_classes = [FastJSONRenderer]
+
+    def post(self, request):
+        try:
+            rows = read_rows(request, "tasks")
+        except BulkPayloadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks, errors = build_tasks(rows, request.user)
+        if errors:
+            return Response(
+                {"created": 0, "errors": [{"row": i, "errors": e} for i, e in errors.items()]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        created = create_tasks(tasks, request.user)
+        return Response(
+            {"created": len(created), "ids": [task.pk for task in created], "errors": []},
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class TaskReportView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/task_reports.html"
 
     def get(self, request):
-        if request.user.role == "superadmin":
-            tasks = Task.objects.filter(status="completed")
-        elif request.user.role == "admin":
-            tasks = Task.objects.filter(
-                assigned_to__assigned_admin=request.user, status="completed"
+        export_format = request.query_params.get("export")
+        if export_format:
+            return self.export(request, export_format)
+
+        try:
+            tasks, archived = completed_tasks(request.user, request.query_params)
+        except ExportFilterError as e:
+            raise ParseError(str(e))
+        if archived is not None:
+            archived = archived.with_people().defer("description")
+        return paginated_response(
+            request, self, tasks.with_people().defer("description"), "tasks",
+            TASK_REPORT_SERIALIZER, archived=archived,
+        )
+
+    def export(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"export must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            tasks = completed_tasks_for_export(request.user, request.query_params)
+        except ExportFilterError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if request.query_params.get("background"):
+            # Written to a file by a worker; poll the job, then download it.
+            params = {
+                key: request.query_params[key]
+                for key in EXPORT_FILTER_PARAMS if key in request.query_params
+            }
+            job = enqueue(
+                "export_tasks", {"format": export_format, "params": params},
+                user_id=request.user.pk,
+            )
+            return Response(job_status(job.pk), status=status.HTTP_202_ACCEPTED)
+        return export_response(tasks, export_format)
+
+
+class TaskRollupReportView(APIView):
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        group = request.query_params.get("group", "day")
+        if group not in ROLLUP_GROUPS:
+            return Response(
+                {"detail": f"group must be one of {', '.join(ROLLUP_GROUPS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        else:
-            tasks = Task.objects.filter(assigned_to=request.user, status="completed")
 
-        return Response({"tasks": tasks})
+        rollups = rollups_for(request.user)
+        for param, lookup in (("from", "day__gte"), ("to", "day__lte")):
+            if request.query_params.get(param):
+                try:
+                    day = parse_date(request.query_params[param])
+                except ValueError:
+                    # Well formed but impossible, such as 2026-02-30.
+                    day = None
+                if day is None:
+                    return Response(
+                        {"detail": f"{param} must be a YYYY-MM-DD date"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                rollups = rollups.filter(**{lookup: day})
+        admin_id = request.query_params.get("admin")
+        if admin_id and request.user.role == "superadmin":
+            if not admin_id.isdigit():
+                return Response(
+                    {"detail": "admin must be a user id"}, status=status.HTTP_400_BAD_REQUEST
+                )
+            rollups = rollups.filter(admin_id=admin_id)
+
+        return Response({"group": group, "rows": rollup_report(rollups, group)})
 
 
 # ---------------- USER TASK ---------------- #
 
-class UserTaskListView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+class UserTaskListView(RoleRequiredMixin, APIView):
+    allowed_roles = ("user",)
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/user_task_list.html"
 
     def get(self, request):
-        if request.user.role != "user":
-            messages.error(request, "Access denied")
-            return redirect("dashboard")
-        tasks = Task.objects.filter(assigned_to=request.user)
-        return Response({"tasks": tasks})
+        tasks = Task.objects.for_user(request.user)
+        return conditional_response(request, tasks, lambda: paginated_response(
+            request, self, tasks.for_list(), "tasks", TASK_LIST_SERIALIZER
+        ))
 
 
 class TaskUpdateView(APIView):
-    renderer_classes = [TemplateHTMLRenderer, JSONRenderer]
+    renderer_classes = [TemplateHTMLRenderer, FastJSONRenderer]
     template_name = "tasks/task_update.html"
 
     def get(self, request, task_id):
-        task = get_object_or_404(Task, id=task_id, assigned_to=request.user)
+        tasks = Task.objects.filter(id=task_id, assigned_to_id=request.user.pk)
+        if request.accepted_renderer.format == "json":
+            task = get_object_or_404(TASK_DETAIL_SERIALIZER.values(tasks, request))
+        else:
+            task = get_object_or_404(tasks)
         return Response({"task": task})
 
     def post(self, request, task_id):
-        task = get_object_or_404(Task, id=task_id, assigned_to=request.user)
+        task = get_object_or_404(Task, id=task_id, assigned_to_id=request.user.pk)
 
         worked_hours = request.data.get("worked_hours")
         completion_report = request.data.get("completion_report")
@@ -321,3 +439,154 @@ class TaskUpdateView(APIView):
         
         messages.success(request, "Task updated successfully")
         return redirect("user_task_list_view")
+
+
+class TaskBulkUpdateView(APIView):
+    renderer_classes = [FastJSONRenderer]
+
+    def post(self, request):
+        try:
+            rows = read_rows(request, "updates")
+        except BulkPayloadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks, errors = build_task_updates(rows, request.user)
+        if errors:
+            return Response(
+                {"updated": 0, "errors": [{"row": i, "errors": e} for i, e in errors.items()]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        apply_task_updates(tasks, request.user)
+        return Response({"updated": len(tasks), "ids": [task.pk for task in tasks], "errors": []})
+
+
+# ---------------- DELTA SYNC ---------------- #
+
+class TaskChangesView(APIView):
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        try:
+            page_size = int(request.query_params.get("page_size", SYNC_PAGE_SIZE))
+        except ValueError:
+            return Response(
+                {"detail": "page_size must be a number"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        page_size = max(1, min(page_size, SYNC_PAGE_SIZE))
+        try:
+            changes = changes_since(
+                request.user,
+                request.query_params.get("cursor"),
+                TASK_LIST_SERIALIZER.select(request, required=("id", "updated_at")),
+                page_size,
+            )
+        except SyncCursorExpired as e:
+            return Response({"detail": str(e)}, status=status.HTTP_410_GONE)
+        except SyncCursorError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(changes)
+
+
+class TaskSearchView(APIView):
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        if not search_terms(query):
+            return Response({"detail": "q must contain a word to search for"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get("limit", SEARCH_MAX_RESULTS))
+        except ValueError:
+            return Response(
+                {"detail": "limit must be a number"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+        fields = TASK_LIST_SERIALIZER.select(request)
+        results = search_tasks(request.user, query, fields, limit)
+        return Response({"query": query, "results": results})
+
+
+# ---------------- JOBS ---------------- #
+
+JOB_FIELDS = (
+    "id", "kind", "status", "attempts", "max_attempts", "progress_done", "progress_total",
+    "result", "error", "created_by_id", "created_at", "updated_at", "run_after", "finished_at",
+)
+# Jobs a superadmin may start directly.
+ADMIN_JOB_KINDS = ("archive_tasks", "rebuild_rollups", "rebuild_search_index")
+
+
+def jobs_for(user):
+    if user.role == "superadmin":
+        return Job.objects.all()
+    return Job.objects.filter(created_by_id=user.pk)
+
+
+def _job_body(job):
+    # The payload may hold ids and filters; only the export format is shown.
+    payload = job.pop("payload")
+    job["format"] = payload.get("format")
+    job["download"] = None
+    if job["kind"] == "export_tasks" and job["status"] == "succeeded":
+        job["download"] = reverse("job_download", args=[job["id"]])
+    return job
+
+
+def job_status(pk):
+    return _job_body(Job.objects.values(*JOB_FIELDS, "payload").get(pk=pk))
+
+
+class JobListView(APIView):
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        jobs = jobs_for(request.user).values(*JOB_FIELDS, "payload")[:50]
+        return Response({"jobs": [_job_body(job) for job in jobs]})
+
+
+class JobCreateView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    renderer_classes = [FastJSONRenderer]
+
+    def post(self, request):
+        kind = request.data.get("kind")
+        if kind not in ADMIN_JOB_KINDS:
+            return Response(
+                {"detail": f"kind must be one of {', '.join(ADMIN_JOB_KINDS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        job = active_job(kind) or enqueue(kind, user_id=request.user.pk)
+        return Response(job_status(job.pk), status=status.HTTP_202_ACCEPTED)
+
+
+class JobDetailView(APIView):
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request, pk):
+        get_object_or_404(jobs_for(request.user), pk=pk)
+        return Response(job_status(pk))
+
+
+class JobDownloadView(APIView):
+    def get(self, request, pk):
+        job = get_object_or_404(
+            jobs_for(request.user), pk=pk, kind="export_tasks", status="succeeded"
+        )
+        path = export_path(job)
+        if not path.exists():
+            raise Http404("The export file has been removed")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name)
+
+
+# ---------------- METRICS ---------------- #
+
+class MetricsView(RoleRequiredMixin, APIView):
+    allowed_roles = ("superadmin",)
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        return HttpResponse(
+            view_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )